@@ -8,6 +8,7 @@ import hashlib
 import logging
 import requests
 import sys
+from operator import itemgetter
 from typing import Dict, List, Any, Tuple, Optional
 
 # Importa configurações da API OpenRouter
@@ -25,6 +26,10 @@ except ImportError:
 
 logger = logging.getLogger("AI-Genesis.Consciousness")
 
+def _state_hash(state: Dict[str, Any]) -> str:
+    """Chave de busca (não criptográfica) para um estado do sistema: BLAKE2b de 8 bytes"""
+    return hashlib.blake2b(str(state).encode("utf-8", "surrogatepass"), digest_size=8).hexdigest()
+
 # --- Interface com OpenRouter --- 
 
 class OpenRouterInterface:
@@ -70,7 +75,7 @@ class OpenRouterInterface:
             return None
             
         # Retorna o modelo com menor número de prioridade (mais prioritário)
-        best_model = sorted(suitable_models, key=lambda x: x[1])[0][0]
+        best_model = min(suitable_models, key=itemgetter(1))[0]
         logger.info(f"Modelo gratuito/alternativo selecionado: {best_model} para capacidades {capabilities_needed}")
         return best_model
     def generate_completion(self, prompt: str, model: Optional[str] = None, capabilities: Optional[List[str]] = None, max_tokens: int = 1000) -> Optional[str]:
@@ -240,14 +245,14 @@ class DeliberationEngine:
         if cycles_since_mod > 10:
              interval = max(interval, 30.0)
 
-        logger.debug(f"Intervalo de reflexão calculado: {interval:.1f}s")
+        logger.debug("Intervalo de reflexão calculado: %.1fs", interval)
         return interval
 
 class InitiativeController:
     """Controlador de iniciativa para decidir quando agir"""
     
     def should_take_action(self, action: Dict[str, Any], system_state: Dict[str, Any]) -> bool:
-        logger.debug(f"Avaliando se deve tomar a ação: {action.get('type')}")
+        logger.debug("Avaliando se deve tomar a ação: %s", action.get('type'))
         # Lógica inicial simples: sempre tenta executar a ação selecionada
         # No futuro, pode considerar estado do sistema, riscos, etc.
         should_act = True 
@@ -411,7 +416,8 @@ class AugmentedCognitionInterface:
             """
         
         if prompt: 
-            logger.debug(f"Prompt gerado para LLM: {prompt[:200]}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Prompt gerado para LLM: %s...", prompt[:200])
             # Adiciona instruções finais para garantir respostas mais úteis
             prompt += """
             
@@ -433,19 +439,19 @@ class EpisodicMemory:
             'action': action,
             'result': result, # Pode ser o resultado do ciclo evolutivo, status da modificação, etc.
             'state_before': system_state_before,
-            'state_hash': hashlib.md5(str(system_state_before).encode()).hexdigest() # Para busca rápida
+            'state_hash': _state_hash(system_state_before) # Para busca rápida
         }
         self.episodes.append(episode)
         
         # Mantém o tamanho da memória
         if len(self.episodes) > self.max_episodes:
             self.episodes.pop(0)
-        logger.debug(f"Episódio registrado. Total: {len(self.episodes)}")
+        logger.debug("Episódio registrado. Total: %d", len(self.episodes))
 
     def retrieve_similar_episodes(self, current_state_hash: str, limit=5) -> List[Dict[str, Any]]:
         # Busca simplificada por hash de estado (pode ser melhorada com embeddings)
         similar = [ep for ep in self.episodes if ep['state_hash'] == current_state_hash]
-        logger.debug(f"{len(similar)} episódios similares encontrados para o estado atual.")
+        logger.debug("%d episódios similares encontrados para o estado atual.", len(similar))
         return similar[-limit:] # Retorna os mais recentes
     
     def extract_heuristics(self) -> Dict[str, float]:
@@ -506,7 +512,7 @@ class ConsciousnessModule:
                 # 1. Auto-reflexão
                 self.last_reflection_time = time.time()
                 system_state = self.self_reflection.analyze_system_state(self.core)
-                state_hash = hashlib.md5(str(system_state).encode()).hexdigest()
+                state_hash = _state_hash(system_state)
                 
                 # 2. Deliberação
                 potential_actions = self.deliberation.generate_potential_actions(system_state)
@@ -6,18 +6,30 @@ Desenvolvido por Zylar de Xylos
 
 import os
 import sys
+import asyncio
 import time
 import json
 import inspect
-import importlib
 import hashlib
 import logging
-from typing import Dict, List, Any, Callable, Optional, Tuple
+from typing import Dict, List, Any, Awaitable, Callable, Optional, Tuple
+from types import MappingProxyType
 import ast
+import re
 import random
-import copy
 import threading
-import traceback
+import weakref
+import pathlib
+import functools
+import bisect
+import difflib
+import zlib
+import io
+from array import array
+from dataclasses import asdict, dataclass, field, is_dataclass
+from collections import Counter, OrderedDict, deque
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
 
 # Importa o módulo de consciência
 try:
@@ -26,9 +38,31 @@ except ImportError as e:
     print(f"Alerta: Não foi possível importar ConsciousnessModule: {e}. Funcionalidade de consciência desabilitada.")
     ConsciousnessModule = None # Define como None se a importação falhar
 
-# Configuração de logging
+# Serializador JSON nativo (opcional) para o caminho de auditoria e registros de ciclo
+# (orjson serializa dataclasses diretamente)
+try:
+    import orjson
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    def _dumps_pretty(obj: Any) -> bytes:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    orjson = None
+    def _json_default(obj: Any) -> Any:
+        # Dataclasses (como CycleResult) viram dicts; demais tipos não serializáveis, str
+        if is_dataclass(obj):
+            return asdict(obj)
+        return str(obj)
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, default=_json_default).encode("utf-8")
+    def _dumps_pretty(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2, default=_json_default).encode("utf-8")
+
+# Configuração de logging (INFO por padrão; AI_GENESIS_LOG_LEVEL=DEBUG reativa o rastreamento detalhado)
+_log_level_name = os.environ.get("AI_GENESIS_LOG_LEVEL", "INFO").upper()
+_log_level = logging.getLevelName(_log_level_name) # Nome desconhecido devolve a string "Level X"
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=_log_level if isinstance(_log_level, int) else logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
     handlers=[
         logging.FileHandler("ai_genesis.log", mode='a', encoding='utf-8'),
@@ -36,6 +70,122 @@ logging.basicConfig(
     ]
 )
 logger = logging.getLogger("AI-Genesis.Core") # Logger específico para o Core
+if not isinstance(_log_level, int):
+    logger.warning("AI_GENESIS_LOG_LEVEL inválido (%r); usando INFO.", _log_level_name)
+
+# Opções compartilhadas por todas as chamadas a ast.parse: sem comentários de tipo
+# (PEP 484) e gramática do interpretador corrente
+_PARSE_KWARGS = {"mode": "exec", "type_comments": False, "feature_version": sys.version_info[:2]}
+
+# Número máximo de versões do código-fonte com AST/hash mantidos em cache
+SOURCE_CACHE_SIZE = 8
+
+def _content_hash(text: str) -> str:
+    """Impressão digital (não criptográfica) de um texto: BLAKE2b de 16 bytes em hexadecimal"""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+# Número máximo de registros de modificações/violações mantidos em memória (o histórico completo fica em mods/audit.jsonl)
+AUDIT_LOG_MAXLEN = 10_000
+
+# Número de registros de ciclo acumulados no buffer antes de forçar a gravação em disco
+CYCLE_LOG_FLUSH_INTERVAL = 100
+
+# Validade (s) do status da consciência em cache, para consultas frequentes (REPL/monitores)
+CONSCIOUSNESS_STATUS_TTL_S = 0.25
+
+# Validade (s) das métricas do sistema em cache para o comando status (consultas repetidas durante evolve)
+SYSTEM_METRICS_TTL_S = 1.0
+
+# Número de resultados "sem modificação" de generate_code_modification mantidos em memória
+NOOP_MODIFICATION_MEMO_SIZE = 256
+
+# Número de resultados de check_security mantidos em memória (por hash do código e do original)
+SECURITY_CHECK_MEMO_SIZE = 128
+
+# Intervalo (em diffs aplicados) entre cópias completas do código evoluído; nos demais grava-se só o diff
+EVOLVED_SNAPSHOT_INTERVAL = 50
+
+@functools.lru_cache(maxsize=None)
+def _class_profile(cls: type) -> Tuple[int, int]:
+    """(linhas de código-fonte, métodos públicos) de uma classe. As classes carregadas não
+    mudam durante a execução (o código evoluído é gravado em disco, não recarregado), e uma
+    classe nova gera uma nova entrada"""
+    complexity = inspect.getsource(cls).count("\n") + 1
+    # Consulta a classe, não a instância: evita criar um método ligado por atributo
+    method_count = sum(1 for m in dir(cls) if not m.startswith("_") and callable(getattr(cls, m, None)))
+    return complexity, method_count
+
+# Mapeamento explícito de prefixos de métricas para nomes de componentes reais.
+# Isso garante que mesmo que as métricas usem nomes abreviados (ex: 'code'), o alvo da hipótese seja o nome correto do componente.
+_METRIC_PREFIX_TO_COMPONENT = MappingProxyType({
+    "meta": "meta_cognition",
+    "code": "code_transformer", # Mapeia 'code' para 'code_transformer'
+    "pattern": "pattern_library",
+    "interface": "interface",
+    "security": "security",
+    "consciousness": "consciousness"
+    # Adicionar outros mapeamentos se necessário
+})
+
+@functools.lru_cache(maxsize=256)
+def _metric_component(metric: str) -> Optional[str]:
+    """Componente ao qual uma métrica pertence (pelo prefixo), resolvido uma vez por nome de métrica"""
+    return _METRIC_PREFIX_TO_COMPONENT.get(metric.partition("_")[0])
+
+# Mapeamento de nomes de componentes para nomes de classes (pode precisar de ajustes)
+_MODULE_TO_CLASS_MAP = MappingProxyType({
+    "meta_cognition": "MetaCognitionCore",
+    "code_transformer": "CodeTransformationEngine",
+    "pattern_library": "EvolutionaryPatternLibrary",
+    "interface": "PerceptionActionInterface",
+    "security": "SecurityLoggingMechanism",
+    "consciousness": "ConsciousnessModule"
+})
+
+# Extração de código das sugestões do LLM: primeiro bloco ```python e linhas que parecem código
+_CODE_FENCE = "```"
+_PYTHON_FENCE = "```python"
+_CODE_LINE_RE = re.compile(r"^\s*(?:def|if|for|while|return|import|class|try|except|with|[A-Za-z_][A-Za-z0-9_]*\s*=)")
+
+# Quebras de linha, para o cálculo dos offsets de início de linha do índice de classes
+_NEWLINE_RE = re.compile("\n")
+
+# Padrões perigosos verificados por check_security (na ordem de relato) e a alternância que os
+# localiza em uma única passada pelo código
+_DANGEROUS_PATTERNS = (
+    ("os.system(", "Chamada direta ao sistema"),
+    ("subprocess.call(", "Chamada de subprocesso"),
+    ("subprocess.run(", "Chamada de subprocesso"),
+    ("eval(", "Uso de eval"),
+    ("exec(", "Uso de exec"),
+    ("__import__(", "Importação dinâmica")
+    # Removido 'open(' pois é necessário para logs e arquivos de configuração
+)
+_DANGEROUS_RE = re.compile("|".join(re.escape(pattern) for pattern, _ in _DANGEROUS_PATTERNS))
+
+def _first_python_block(text: str) -> Optional[str]:
+    """Conteúdo do primeiro bloco ```python de `text` (até a cerca seguinte), ou None.
+    Duas buscas com str.find, sem passar pelo mecanismo de regex."""
+    start = text.find(_PYTHON_FENCE)
+    if start == -1:
+        return None
+    start += len(_PYTHON_FENCE)
+    end = text.find(_CODE_FENCE, start)
+    if end == -1:
+        return None
+    return text[start:end]
+
+def _apply_insertions(source: str, insertions: List[Tuple[int, str]]) -> str:
+    """Insere trechos em `source` nos offsets informados (relativos ao texto original),
+    montando o resultado em uma única passada com str.join"""
+    parts = []
+    prev = 0
+    for offset, text in sorted(insertions, key=lambda item: item[0]):
+        parts.append(source[prev:offset])
+        parts.append(text)
+        prev = offset
+    parts.append(source[prev:])
+    return "".join(parts)
 
 # --- Componentes Principais (MetaCognition, CodeTransformation, etc.) ---
 # (Código das classes MetaCognitionCore, CodeTransformationEngine, 
@@ -49,38 +199,63 @@ class MetaCognitionCore:
         self.performance_metrics = {}
         self.improvement_hypotheses = []
         self.system_state = {}
-        self.evaluation_history = []
+        # Histórico de avaliações em colunas paralelas (ver propriedade evaluation_history)
+        self.evaluation_timestamps = array("d")
+        self.evaluation_metrics = []
+        # componente -> (nome, _version, métricas prefixadas); entradas somem com o componente
+        self._metric_cache = weakref.WeakKeyDictionary()
         logger.info("Núcleo de Meta-Cognição inicializado")
     
-    def evaluate_system(self, modules: Dict[str, Any]) -> Dict[str, float]:
-        """Avalia o desempenho atual do sistema"""
+    @property
+    def evaluation_history(self) -> List[Dict[str, Any]]:
+        """Histórico de avaliações como lista de registros {timestamp, metrics} (montado sob demanda)"""
+        return [{"timestamp": t, "metrics": m} for t, m in zip(self.evaluation_timestamps, self.evaluation_metrics)]
+    
+    def evaluate_system(self, modules: Dict[str, Any], record: bool = True) -> Dict[str, float]:
+        """Avalia o desempenho atual do sistema
+
+        Com record=False (consultas de status), a avaliação não entra no histórico nem em
+        performance_metrics, que orientam a geração de hipóteses do ciclo de evolução.
+        """
         metrics = {}
         
         # Avaliação básica de cada módulo
         for name, module in modules.items():
             if module is None: continue # Pula módulos não inicializados (como consciência)
             try:
+                # Reaproveita a avaliação anterior se o componente não mudou: componentes com
+                # get_metrics() precisam expor um contador _version incrementado a cada mudança de estado
+                version = getattr(module, "_version", None)
+                has_metrics = callable(getattr(module, "get_metrics", None))
+                cached = self._metric_cache.get(module)
+                if cached is not None and cached[0] == name and cached[1] == version and (version is not None or not has_metrics):
+                    metrics.update(cached[2])
+                    continue
+                
+                module_entry = {}
                 # Verifica complexidade do código
-                source = inspect.getsource(module.__class__)
-                complexity = len(source.split("\n"))
+                complexity, method_count = _class_profile(module.__class__)
                 
                 # Métricas iniciais simples
-                metrics[f"{name}_complexity"] = complexity
-                metrics[f"{name}_methods"] = len([m for m in dir(module) if not m.startswith("_") and callable(getattr(module, m))])
+                module_entry[f"{name}_complexity"] = complexity
+                module_entry[f"{name}_methods"] = method_count
                 
                 # Registra métricas específicas se o módulo implementar get_metrics()
-                if hasattr(module, "get_metrics") and callable(getattr(module, "get_metrics")):
+                if has_metrics:
                     module_metrics = module.get_metrics()
                     for k, v in module_metrics.items():
-                        metrics[f"{name}_{k}"] = v
+                        module_entry[f"{name}_{k}"] = v
+                metrics.update(module_entry)
+                self._metric_cache[module] = (name, version, module_entry)
             except Exception as e:
                 logger.warning(f"Erro ao avaliar módulo {name}: {e}")
         
+        if not record:
+            return metrics
+
         # Registra histórico de avaliação
-        self.evaluation_history.append({
-            "timestamp": time.time(),
-            "metrics": metrics
-        })
+        self.evaluation_timestamps.append(time.time())
+        self.evaluation_metrics.append(metrics)
         
         self.performance_metrics = metrics
         return metrics
@@ -89,45 +264,33 @@ class MetaCognitionCore:
         """Gera hipóteses para melhorias no sistema, com maior diversidade e precisão, garantindo alvos válidos e mapeamento correto."""
         hypotheses = []
         
-        # Mapeamento explícito de prefixos de métricas para nomes de componentes reais
-        # Isso garante que mesmo que as métricas usem nomes abreviados (ex: 'code'), o alvo da hipótese seja o nome correto do componente.
-        metric_prefix_to_component = {
-            "meta": "meta_cognition",
-            "code": "code_transformer", # Mapeia 'code' para 'code_transformer'
-            "pattern": "pattern_library",
-            "interface": "interface",
-            "security": "security",
-            "consciousness": "consciousness"
-            # Adicionar outros mapeamentos se necessário
-        }
-
         # Obtém a lista de nomes de componentes *reais* e válidos
         valid_component_names = list(self.core.components.keys()) if hasattr(self, 'core') and hasattr(self.core, 'components') and self.core.components else []
         
         if not valid_component_names:
             logger.warning("Não foi possível determinar componentes válidos para geração de hipóteses.")
             # Tenta derivar do histórico como fallback, mas ainda aplica mapeamento
-            if hasattr(self, 'evaluation_history') and self.evaluation_history:
-                metrics_keys = self.evaluation_history[-1]['metrics'].keys()
-                derived_prefixes = list(set([k.split('_')[0] for k in metrics_keys]))
-                valid_component_names = [metric_prefix_to_component.get(prefix, None) for prefix in derived_prefixes]
+            if self.evaluation_metrics:
+                metrics_keys = self.evaluation_metrics[-1].keys()
+                derived_prefixes = {k.partition('_')[0] for k in metrics_keys}
+                valid_component_names = [_METRIC_PREFIX_TO_COMPONENT.get(prefix, None) for prefix in derived_prefixes]
                 valid_component_names = [name for name in valid_component_names if name is not None] # Filtra nulos
             else:
                  return [] # Retorna lista vazia se não há como determinar alvos
 
-        logger.debug(f"Componentes válidos para hipóteses: {valid_component_names}")
+        logger.debug("Componentes válidos para hipóteses: %s", valid_component_names)
+        valid_component_set = frozenset(valid_component_names) # Teste de pertinência O(1) por métrica
 
         # 1. Hipóteses baseadas em histórico de métricas (Refatoração)
-        if len(self.evaluation_history) >= 2:
-            current = self.evaluation_history[-1]["metrics"]
-            previous = self.evaluation_history[-2]["metrics"]
+        if len(self.evaluation_metrics) >= 2:
+            current = self.evaluation_metrics[-1]
+            previous = self.evaluation_metrics[-2]
             
             for metric, value in current.items():
-                metric_prefix = metric.split("_")[0]
-                target_component = metric_prefix_to_component.get(metric_prefix) # Obtém nome real do componente
+                target_component = _metric_component(metric) # Obtém nome real do componente
                 
                 # Garante que o componente alvo é válido
-                if not target_component or target_component not in valid_component_names: continue 
+                if not target_component or target_component not in valid_component_set: continue 
 
                 if metric in previous and isinstance(value, (int, float)):
                     if "_complexity" in metric and value > previous[metric] * 1.15: 
@@ -149,15 +312,15 @@ class MetaCognitionCore:
         # 2. Hipóteses de Expansão de Capacidades (para componentes existentes válidos)
         component_metrics_count = {}
         for metric in self.performance_metrics:
-            metric_prefix = metric.split("_")[0]
-            target_component = metric_prefix_to_component.get(metric_prefix)
-            if target_component and target_component in valid_component_names:
+            target_component = _metric_component(metric)
+            if target_component and target_component in valid_component_set:
                  component_metrics_count[target_component] = component_metrics_count.get(target_component, 0) + 1
         
         # Diversifica os alvos usando um sistema de rotação com prioridade variável
-        cycle_count = len(self.evaluation_history) if hasattr(self, 'evaluation_history') else 0
+        cycle_count = len(self.evaluation_metrics)
         # Rotaciona os componentes a cada ciclo para garantir diversidade
-        rotated_components = valid_component_names[cycle_count % len(valid_component_names):] + valid_component_names[:cycle_count % len(valid_component_names)]
+        pivot = cycle_count % len(valid_component_names) if valid_component_names else 0
+        rotated_components = valid_component_names[pivot:] + valid_component_names[:pivot]
         
         for i, component_name in enumerate(rotated_components):
             count = component_metrics_count.get(component_name, 0)
@@ -191,9 +354,12 @@ class MetaCognitionCore:
 
         # 4. Hipótese de integração entre módulos (nova)
         if len(valid_component_names) >= 2:
-            # Escolhe dois componentes aleatórios para integração
-            import random
-            components_to_integrate = random.sample(valid_component_names, 2)
+            # Escolhe dois componentes aleatórios e distintos para integração (sem montar um pool de amostragem)
+            n = len(valid_component_names)
+            i = random.randrange(n)
+            j = random.randrange(n - 1)
+            j += j >= i
+            components_to_integrate = (valid_component_names[i], valid_component_names[j])
             hypotheses.append({
                 "target": components_to_integrate[0],
                 "type": "expand_functionality",
@@ -205,44 +371,21 @@ class MetaCognitionCore:
         # Garante diversidade limitando hipóteses do mesmo tipo/alvo
         unique_hypotheses = []
         type_target_pairs = set()
+        type_counts = Counter()
         
-        # Ordena por prioridade antes de filtrar
-        hypotheses.sort(key=lambda h: h.get("priority", 0), reverse=True)
+        # Ordena por prioridade antes de filtrar (toda hipótese gerada acima define "priority")
+        hypotheses.sort(key=itemgetter("priority"), reverse=True)
         
         for h in hypotheses:
-            pair = (h.get("type"), h.get("target"))
-            if pair not in type_target_pairs:
-                unique_hypotheses.append(h)
-                type_target_pairs.add(pair)
-                # Limita a 2 hipóteses por tipo para garantir diversidade
-                if list(t[0] for t in type_target_pairs).count(h.get("type")) >= 2:
-                    continue
+            h_type = h.get("type")
+            pair = (h_type, h.get("target"))
+            # Descarta pares tipo/alvo repetidos e limita a 2 hipóteses por tipo para garantir diversidade
+            if pair in type_target_pairs or type_counts[h_type] >= 2:
+                continue
+            unique_hypotheses.append(h)
+            type_target_pairs.add(pair)
+            type_counts[h_type] += 1
         
-        logger.info(f"{len(unique_hypotheses)} hipóteses de melhoria únicas e válidas geradas.")
-        return unique_hypotheses
-             target_component = random.choice(valid_component_names) # Escolhe de componentes válidos
-             hypotheses.append({
-                 "target": target_component,
-                 "type": "optimize_performance",
-                 "reason": f"Tentativa proativa de otimização para {target_component}",
-                 "priority": 0.4
-             })
-
-        # Remove duplicatas e garante alvos válidos
-        unique_hypotheses = []
-        seen = set()
-        for h in hypotheses:
-            target = h.get('target')
-            # Garante que hipóteses com alvo específico tenham um alvo válido conhecido
-            if target != 'system' and target not in valid_component_names:
-                logger.warning(f"Descartando hipótese com alvo inválido ou desconhecido: {h}")
-                continue 
-                
-            key = (target, h.get('type'))
-            if key not in seen:
-                unique_hypotheses.append(h)
-                seen.add(key)
-
         self.improvement_hypotheses = unique_hypotheses
         logger.info(f"{len(unique_hypotheses)} hipóteses de melhoria únicas e válidas geradas.")
         return unique_hypotheses
@@ -252,179 +395,202 @@ class CodeTransformationEngine:
     """Motor de Transformação de Código (MTC) - Modifica o código-fonte do próprio sistema"""
     
     def __init__(self):
-        self.transformation_history = []
+        # Histórico de transformações em colunas paralelas (ver propriedade transformation_history)
+        self.transformation_timestamps = array("d")
+        self.transformation_hypotheses = []
+        self.transformation_descriptions = []
         self.current_transformations = []
+        self._class_index_cache = (None, None) # (AST, índice de classes) da última versão consultada
+        self._noop_memo = OrderedDict() # (código, tipo, alvo) -> descrição de hipóteses sem efeito (LRU)
         logger.info("Motor de Transformação de Código inicializado")
     
-    def analyze_code(self, source_code: str) -> Dict[str, Any]:
-        """Analisa o código-fonte para entender sua estrutura"""
+    @property
+    def transformation_history(self) -> List[Dict[str, Any]]:
+        """Histórico de transformações como lista de registros {timestamp, hypothesis, description} (montado sob demanda)"""
+        return [{"timestamp": t, "hypothesis": h, "description": d}
+                for t, h, d in zip(self.transformation_timestamps, self.transformation_hypotheses, self.transformation_descriptions)]
+    
+    def analyze_code(self, source_code: str, tree: Optional[ast.AST] = None) -> Dict[str, Any]:
+        """Analisa o código-fonte para entender sua estrutura
+
+        Args:
+            source_code: Código a ser analisado
+            tree: (Opcional) AST já obtida para `source_code`; dispensa um novo parse
+        """
         analysis = {
             "length": len(source_code),
-            "lines": len(source_code.split("\n")),
+            "lines": source_code.count("\n") + 1,
             "classes": 0,
             "functions": 0,
             "imports": []
         }
         
         try:
-            tree = ast.parse(source_code)
+            if tree is None:
+                tree = ast.parse(source_code, **_PARSE_KWARGS)
             
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    analysis["classes"] += 1
-                elif isinstance(node, ast.FunctionDef):
-                    analysis["functions"] += 1
-                elif isinstance(node, ast.Import):
-                    for name in node.names:
-                        analysis["imports"].append(name.name)
-                elif isinstance(node, ast.ImportFrom):
-                    analysis["imports"].append(f"{node.module}")
+            # Percorre só as instruções: classes, funções e importações nunca são expressões
+            analyzer = _CodeAnalyzer()
+            analyzer.visit(tree)
+            analysis["classes"] = analyzer.classes
+            analysis["functions"] = analyzer.functions
+            analysis["imports"] = analyzer.imports
         except Exception as e:
             logger.error(f"Erro ao analisar código: {e}")
         
         return analysis
     
-    def generate_code_modification(self, source_code: str, hypothesis: Dict[str, Any], llm_suggestion: Optional[str] = None) -> Tuple[str, str]:
+    def _class_index(self, source_code: str, tree: Optional[ast.AST] = None) -> Optional[Dict[str, Tuple[int, int]]]:
+        """Mapeia cada classe de nível superior para (início, fim) em offsets de `source_code`.
+        O início aponta para `class`; o fim, para o início da linha seguinte à classe.
+        Reaproveita o índice enquanto a mesma AST (cache do Core) for informada.
+        Retorna None se o código não puder ser parseado."""
+        cached_tree, cached_index = self._class_index_cache
+        if tree is not None and tree is cached_tree:
+            return cached_index
+        try:
+            parsed = tree if tree is not None else ast.parse(source_code, **_PARSE_KWARGS)
+        except SyntaxError:
+            return None
+        # Offsets de início de cada linha (numeração de linhas da AST: apenas "\n")
+        line_starts = [0]
+        line_starts.extend(m.end() for m in _NEWLINE_RE.finditer(source_code))
+        index = {}
+        for node in parsed.body:
+            if isinstance(node, ast.ClassDef) and node.name not in index:
+                start = line_starts[node.lineno - 1] + node.col_offset
+                end = line_starts[node.end_lineno] if node.end_lineno < len(line_starts) else len(source_code)
+                index[node.name] = (start, end)
+        if tree is not None:
+            self._class_index_cache = (tree, index)
+        return index
+
+    def generate_code_modification(self, source_code: str, hypothesis: Dict[str, Any], llm_suggestion: Optional[str] = None,
+                                   tree: Optional[ast.AST] = None) -> Tuple[str, str]:
         """Gera uma modificação de código baseada em uma hipótese, tentando gerar código funcional ou placeholders mais estruturados.
         
         Args:
             source_code: O código-fonte atual.
             hypothesis: Dicionário descrevendo a melhoria proposta.
             llm_suggestion: (Opcional) Código ou descrição sugerida pelo LLM.
+            tree: (Opcional) AST já obtida para `source_code` (cache do Core); dispensa um novo parse.
 
         Returns:
             Tupla contendo (código modificado, descrição da modificação).
-                modification_type = hypothesis.get("type", "")
+        """
+        # Hipóteses que não alteram o código (alvo inválido, tipo não suportado) dependem apenas
+        # do código, do tipo e do alvo: o resultado é memorizado para repetições nos ciclos seguintes
+        memo_key = None
+        if llm_suggestion is None:
+            memo_key = (len(source_code), hash(source_code), hypothesis.get("type", ""), hypothesis.get("target", ""))
+            description = self._noop_memo.get(memo_key)
+            if description is not None:
+                self._noop_memo.move_to_end(memo_key)
+                logger.debug("Hipótese sem efeito já avaliada para este código: %s", description)
+                return source_code, description
+        
+        modified_code, description = self._build_code_modification(source_code, hypothesis, llm_suggestion, tree)
+        
+        if memo_key is not None and modified_code == source_code:
+            self._noop_memo[memo_key] = description
+            if len(self._noop_memo) > NOOP_MODIFICATION_MEMO_SIZE:
+                self._noop_memo.popitem(last=False)
+        return modified_code, description
+
+    def _build_code_modification(self, source_code: str, hypothesis: Dict[str, Any], llm_suggestion: Optional[str],
+                                 tree: Optional[ast.AST]) -> Tuple[str, str]:
+        """Implementação de generate_code_modification (sem memorização)"""
+        modification_type = hypothesis.get("type", "")
         target = hypothesis.get("target", "")
         reason = hypothesis.get("reason", "N/A") # Captura a razão da hipótese
         modified_code = source_code
         description = "Nenhuma modificação significativa gerada"
         
-        # Mapeamento de nomes de módulos para nomes de classes (pode precisar de ajustes)
-        module_to_class_map = {
-            "meta_cognition": "MetaCognitionCore",
-            "code_transformer": "CodeTransformationEngine",
-            "pattern_library": "EvolutionaryPatternLibrary",
-            "interface": "PerceptionActionInterface",
-            "security": "SecurityLoggingMechanism",
-            "consciousness": "ConsciousnessModule"
-        }
-
         try:
-            target_class_name = module_to_class_map.get(target)
-            class_pattern = f"class {target_class_name}" if target_class_name else None
-            logger.debug(f"Tentando modificar. Tipo: {modification_type}, Alvo: {target}, Classe Alvo: {target_class_name}, Razão: {reason}")
+            target_class_name = _MODULE_TO_CLASS_MAP.get(target)
+            # Posição (início, fim) da classe alvo no código, via índice construído da AST
+            class_span = None
+            if target_class_name:
+                class_index = self._class_index(source_code, tree)
+                if class_index is None:
+                    # Qualquer modificação de um código inválido seria rejeitada na verificação de sintaxe
+                    logger.warning("Código-fonte atual não pôde ser parseado; classe alvo não localizada.")
+                else:
+                    class_span = class_index.get(target_class_name)
+            logger.debug("Tentando modificar. Tipo: %s, Alvo: %s, Classe Alvo: %s, Razão: %s", modification_type, target, target_class_name, reason)
 
             # --- Tratamento das Hipóteses --- 
 
             if modification_type == "refactor_simplification":
-                if target_class_name and class_pattern in source_code:
-                    # TODO: Usar LLM para sugerir refatoração específica?
-                    insertion_point = source_code.find(class_pattern)
-                    todo_comment = f"\n    # TODO: [Refatoração] {reason}. Analisar e simplificar métodos em {target_class_name}.\n"
-                    modified_code = source_code[:insertion_point] + todo_comment + source_code[insertion_point:]
-                    description = f"Adicionado lembrete TODO para refatorar/simplificar {target_class_name} devido a: {reason}"
-                    logger.info(description)
-                else:
-                    description = f"Alvo inválido ou não encontrado para refatoração: {target}"
-                    logger.warning(description)
+                # TODO: Usar LLM para sugerir refatoração específica?
+                modified_code, description = self._insert_todo_comment(
+                    source_code, target, target_class_name, class_span, "Refatoração", reason)
+                if class_span is None:
                     # Retorna sem modificar se o alvo for inválido
-                    return source_code, description 
+                    return modified_code, description
             
             elif modification_type == "expand_functionality":
-                if target_class_name and class_pattern in source_code:
-                    # Encontra o final da classe para inserir o novo método
-                    class_end_index = -1
-                    try:
-                        tree = ast.parse(source_code)
-                        for node in ast.walk(tree):
-                            if isinstance(node, ast.ClassDef) and node.name == target_class_name:
-                                class_end_line = node.end_lineno
-                                lines = source_code.splitlines()
-                                if class_end_line < len(lines):
-                                     class_end_index = sum(len(l) + 1 for l in lines[:class_end_line])
-                                else:
-                                     class_end_index = len(source_code)
-                                break
-                    except Exception as e:
-                        logger.warning(f"Falha ao usar AST para encontrar fim da classe {target_class_name}, usando busca por string: {e}")
-                        start_index = source_code.find(class_pattern)
-                        if start_index != -1:
-                            next_class_index = source_code.find("\nclass ", start_index + 1)
-                            if next_class_index != -1:
-                                class_end_index = next_class_index
-                            else:
-                                class_end_index = len(source_code)
+                if class_span is not None:
+                    # O novo método é inserido no final da classe
+                    class_end_index = class_span[1]
                     
-                    if class_end_index != -1:
-                        func_name = f"enhance_{target}_capability_{random.randint(100, 999)}"
-                        # Prepara corpo do método, integrando sugestão LLM se disponível (Passo 028)
-                        method_body = f"        # Método gerado para: {reason}\n        pass"
-                        if llm_suggestion:
-                             # Passo 028: Processar e integrar llm_suggestion no código real
-                             try:
-                                 # Tenta extrair código Python funcional da sugestão do LLM
-                                 code_pattern = re.compile(r'```python(.*?)```', re.DOTALL)
-                                 code_blocks = code_pattern.findall(llm_suggestion)
+                    func_name = f"enhance_{target}_capability_{random.randint(100, 999)}"
+                    # Prepara corpo do método, integrando sugestão LLM se disponível (Passo 028)
+                    method_body = f"        # Método gerado para: {reason}\n        pass"
+                    if llm_suggestion:
+                         # Passo 028: Processar e integrar llm_suggestion no código real
+                         try:
+                             # Tenta extrair código Python funcional da sugestão do LLM
+                             code_block = _first_python_block(llm_suggestion)
+                             
+                             if code_block is not None:
+                                 # Usa o primeiro bloco de código encontrado
+                                 code = code_block.strip()
+                                 # Ajusta a indentação para o método
+                                 code_lines = code.split('\n')
+                                 indented_code = '\n        '.join(code_lines)
+                                 # Integra o código sugerido diretamente
+                                 method_body = f"        # Código funcional sugerido pelo LLM:\n        {indented_code}"
+                             else:
+                                 # Se não encontrar blocos de código, tenta extrair linhas que parecem código Python
+                                 # Heurística simples: linhas que parecem código Python
+                                 code_lines = list(filter(_CODE_LINE_RE.match, llm_suggestion.splitlines()))
                                  
-                                 if code_blocks:
-                                     # Usa o primeiro bloco de código encontrado
-                                     code = code_blocks[0].strip()
-                                     # Ajusta a indentação para o método
-                                     code_lines = code.split('\n')
+                                 if code_lines:
                                      indented_code = '\n        '.join(code_lines)
-                                     # Integra o código sugerido diretamente
-                                     method_body = f"        # Código funcional sugerido pelo LLM:\n        {indented_code}"
+                                     method_body = f"        # Código extraído da sugestão do LLM:\n        {indented_code}"
                                  else:
-                                     # Se não encontrar blocos de código, tenta extrair linhas que parecem código Python
-                                     lines = llm_suggestion.split('\n')
-                                     code_lines = []
-                                     for line in lines:
-                                         # Heurística simples: linhas que parecem código Python
-                                         if re.match(r'^\s*(def|if|for|while|return|import|class|try|except|with|[a-zA-Z_][a-zA-Z0-9_]*\s*=)', line):
-                                             code_lines.append(line)
-                                     
-                                     if code_lines:
-                                         indented_code = '\n        '.join(code_lines)
-                                         method_body = f"        # Código extraído da sugestão do LLM:\n        {indented_code}"
-                                     else:
-                                         # Se não conseguir extrair código, usa a sugestão como comentário
-                                         processed_suggestion = llm_suggestion.replace("\n", "\n        # ")
-                                         method_body = f"        # Implementação sugerida por LLM (requer implementação manual):\n        # {processed_suggestion}\n        pass # TODO: Implementar baseado na sugestão acima"
-                             except Exception as e:
-                                 logger.warning(f"Erro ao processar sugestão do LLM: {e}")
-                                 # Fallback: usa a sugestão como comentário
-                                 processed_suggestion = llm_suggestion.replace("\n", "\n        # ")
-                                 method_body = f"        # Sugestão do LLM (não foi possível processar automaticamente):\n        # {processed_suggestion}\n        pass # TODO: Implementar manualmente"
-                        else:
-                             method_body = f"        # Método gerado para: {reason}\n        logger.info(f\"Executando {func_name} com argumentos {{args}} e {{kwargs}}\")\n        # TODO: Implementar funcionalidade real aqui\n        return {{'status': 'success', 'message': f\"Método {func_name} executado\"}}"
-                        
-                        new_method = f"\n    def {func_name}(self, *args, **kwargs):
-        """Nova capacidade para {target_class_name} baseada na hipótese: {reason}."""
-{method_body}\n"
-                        modified_code = source_code[:class_end_index] + new_method + source_code[class_end_index:]
-                        description = f"Adicionado método {func_name} para expandir {target_class_name} (Razão: {reason})"
-                        logger.info(description)
+                                     # Se não conseguir extrair código, usa a sugestão como comentário
+                                     processed_suggestion = llm_suggestion.replace("\n", "\n        # ")
+                                     method_body = f"        # Implementação sugerida por LLM (requer implementação manual):\n        # {processed_suggestion}\n        pass # TODO: Implementar baseado na sugestão acima"
+                         except Exception as e:
+                             logger.warning(f"Erro ao processar sugestão do LLM: {e}")
+                             # Fallback: usa a sugestão como comentário
+                             processed_suggestion = llm_suggestion.replace("\n", "\n        # ")
+                             method_body = f"        # Sugestão do LLM (não foi possível processar automaticamente):\n        # {processed_suggestion}\n        pass # TODO: Implementar manualmente"
                     else:
-                        description = f"Não foi possível encontrar ponto de inserção para novo método em {target_class_name}"
-                        logger.warning(description)
+                         method_body = f"        # Método gerado para: {reason}\n        logger.info(f\"Executando {func_name} com argumentos {{args}} e {{kwargs}}\")\n        # TODO: Implementar funcionalidade real aqui\n        return {{'status': 'success', 'message': f\"Método {func_name} executado\"}}"
+                    
+                    new_method = (
+                        f"\n    def {func_name}(self, *args, **kwargs):\n"
+                        f"        \"\"\"Nova capacidade para {target_class_name} baseada na hipótese: {reason}.\"\"\"\n"
+                        f"{method_body}\n"
+                    )
+                    modified_code = _apply_insertions(source_code, [(class_end_index, new_method)])
+                    description = f"Adicionado método {func_name} para expandir {target_class_name} (Razão: {reason})"
+                    logger.info(description)
                 else:
                     description = f"Alvo inválido ou não encontrado para expansão: {target}"
                     logger.warning(description)
                     return source_code, description
 
             elif modification_type == "optimize_performance":
-                 if target_class_name and class_pattern in source_code:
-                    # TODO: Usar LLM para sugerir otimização específica?
-                    insertion_point = source_code.find(class_pattern)
-                    todo_comment = f"\n    # TODO: [Otimização] {reason}. Analisar e otimizar desempenho em {target_class_name}.\n"
-                    modified_code = source_code[:insertion_point] + todo_comment + source_code[insertion_point:]
-                    description = f"Adicionado lembrete TODO para otimizar {target_class_name} devido a: {reason}"
-                    logger.info(description)
-                 else:
-                    description = f"Alvo inválido ou não encontrado para otimização: {target}"
-                    logger.warning(description)
-                    return source_code, description
+                # TODO: Usar LLM para sugerir otimização específica?
+                modified_code, description = self._insert_todo_comment(
+                    source_code, target, target_class_name, class_span, "Otimização", reason)
+                if class_span is None:
+                    # Retorna sem modificar se o alvo for inválido
+                    return modified_code, description
             
             elif modification_type == "create_new_module":
                 # TODO: Implementar geração de nova classe/módulo
@@ -443,77 +609,50 @@ class CodeTransformationEngine:
         # Garante que sempre retorna uma tupla válida
         if modified_code == source_code:
              description = "Nenhuma modificação significativa gerada ou erro ocorreu."
-             
-        return modified_code, descriptions AIGenesisCore:")
-                    core_init_func = modified_code.find("def __init__(self):", core_init_start)
-                    components_dict_start = modified_code.find("self.components = {", core_init_func)
-                    components_dict_end = modified_code.find("}", components_dict_start)
-                    
-                    if core_init_func != -1 and components_dict_end != -1:
-                        instance_name = new_module_base_name.lower()
-                        instantiation_line = f"        self.{instance_name} = {new_module_base_name}(self)\n"
-                        component_line = f"            \"{instance_name}\": self.{instance_name},\n"
-                        
-                        # Insere a instanciação antes do self.components
-                        modified_code = modified_code[:components_dict_start] + instantiation_line + modified_code[components_dict_start:]
-                        # Atualiza o ponto final do dicionário após a inserção
-                        components_dict_end = modified_code.find("}", components_dict_start + len(instantiation_line))
-                        # Insere no dicionário self.components
-                        modified_code = modified_code[:components_dict_end] + component_line + modified_code[components_dict_end:]
-                        
-                        description = f"Adicionado novo módulo {new_module_base_name} e instanciado no Core"
-                        logger.info(description)
-                    else:
-                        # Se não conseguir instanciar, apenas adiciona a classe
-                        description = f"Adicionado novo módulo placeholder: {new_module_base_name} (instanciação falhou)"
-                        logger.warning(f"Falha ao encontrar pontos de instanciação para {new_module_base_name}")
-                else:
-                    description = "Não foi possível encontrar o ponto de inserção para novo módulo (main guard)."
-                    logger.warning(description)
-                    return source_code, description
-
-            elif modification_type == "optimize_performance":
-                if target_class_name and class_pattern in source_code:
-                    # Implementação inicial: Adiciona comentário TODO para otimização
-                    insertion_point = source_code.find(class_pattern)
-                    todo_comment = f"\n    # TODO: Analisar e otimizar desempenho deste módulo ({target}) - {hypothesis.get('reason')}\n"
-                    modified_code = source_code[:insertion_point] + todo_comment + source_code[insertion_point:]
-                    description = f"Adicionado lembrete TODO para otimizar desempenho de {target_class_name}"
-                    logger.info(description)
-                else:
-                    description = f"Alvo inválido ou não encontrado para otimização: {target}"
-                    logger.warning(description)
-                    return source_code, description
-            
-            else:
-                # Hipótese não reconhecida ou sem ação definida
-                description = f"Tipo de hipótese não tratado ou sem ação definida: {modification_type}"
-                logger.warning(description)
-                return source_code, description
-
-        except Exception as e:
-            logger.error(f"Erro fatal ao gerar modificação de código para hipótese {hypothesis}: {e}", exc_info=True)
-            return source_code, f"Erro na geração: {str(e)}"
-        
-        # Registra a transformação apenas se o código realmente mudou
-        if modified_code != source_code:
-            self.transformation_history.append({
-                "timestamp": time.time(),
-                "hypothesis": hypothesis,
-                "description": description
-            })
-            logger.info(f"Modificação gerada: {description}")
-            return modified_code, description
         else:
-            # Retorna a descrição mesmo que o código não tenha mudado (ex: TODO adicionado)
-            # Ou retorna a descrição de falha se aplicável
-            logger.info(f"Nenhuma alteração de código aplicada para: {description}")
-            return source_code, descriptionon 
+            # Registra a transformação apenas se o código realmente mudou
+            self.transformation_timestamps.append(time.time())
+            self.transformation_hypotheses.append(hypothesis)
+            self.transformation_descriptions.append(description)
+
+        return modified_code, description
     
-    def test_modified_code(self, code: str) -> bool:
-        """Testa se o código modificado é sintaticamente válido"""
+    # Textos do lembrete TODO por tag: (ação no comentário, ação na descrição, nome da hipótese)
+    _TODO_TEXTS = MappingProxyType({
+        "Refatoração": ("simplificar métodos em", "refatorar/simplificar", "refatoração"),
+        "Otimização": ("otimizar desempenho em", "otimizar", "otimização"),
+    })
+
+    def _insert_todo_comment(self, source_code: str, target: str, target_class_name: Optional[str],
+                             class_span: Optional[Tuple[int, int]], tag: str, reason: str) -> Tuple[str, str]:
+        """Insere um lembrete TODO no início da classe alvo.
+
+        Returns:
+            Tupla (código modificado, descrição); o código volta inalterado se o alvo não foi localizado.
+        """
+        comment_action, description_action, hypothesis_name = self._TODO_TEXTS[tag]
+        if class_span is None:
+            description = f"Alvo inválido ou não encontrado para {hypothesis_name}: {target}"
+            logger.warning(description)
+            return source_code, description
+        todo_comment = f"\n    # TODO: [{tag}] {reason}. Analisar e {comment_action} {target_class_name}.\n"
+        modified_code = _apply_insertions(source_code, [(class_span[0], todo_comment)])
+        description = f"Adicionado lembrete TODO para {description_action} {target_class_name} devido a: {reason}"
+        logger.info(description)
+        return modified_code, description
+
+    def test_modified_code(self, code: str, tree: Optional[ast.AST] = None) -> bool:
+        """Testa se o código modificado é sintaticamente válido
+
+        Args:
+            code: Código a ser testado
+            tree: (Opcional) AST já obtida para `code`; dispensa um novo parse
+        """
+        if tree is not None:
+            logger.debug("Código modificado é sintaticamente válido (AST em cache).")
+            return True
         try:
-            ast.parse(code)
+            ast.parse(code, **_PARSE_KWARGS)
             logger.debug("Código modificado é sintaticamente válido.")
             return True
         except SyntaxError as e:
@@ -528,12 +667,16 @@ class EvolutionaryPatternLibrary:
         self.patterns = {}
         self.pattern_usage = {}
         self.pattern_effectiveness = {}
+        # Índice ordenado de chaves (-efetividade, ordem de inserção, id), mantido nas atualizações
+        self._by_effectiveness = []
+        self._effectiveness_keys = {} # id -> chave atual em _by_effectiveness
+        self._pattern_seq = 0
         logger.info("Biblioteca de Padrões Evolutivos inicializada")
         # Adicionar padrões iniciais aqui se necessário
     
     def add_pattern(self, name: str, pattern_code: str, description: str) -> bool:
         """Adiciona um novo padrão à biblioteca"""
-        pattern_id = hashlib.md5(pattern_code.encode()).hexdigest()
+        pattern_id = _content_hash(pattern_code)
         
         self.patterns[pattern_id] = {
             "name": name,
@@ -543,7 +686,7 @@ class EvolutionaryPatternLibrary:
         }
         
         self.pattern_usage[pattern_id] = 0
-        self.pattern_effectiveness[pattern_id] = 0.5  # Valor inicial neutro
+        self._set_effectiveness(pattern_id, 0.5)  # Valor inicial neutro
         
         logger.info(f"Padrão adicionado: {name} ({pattern_id})")
         return True
@@ -559,14 +702,19 @@ class EvolutionaryPatternLibrary:
         """Recupera padrões ordenados por efetividade"""
         effective_patterns = []
         
-        for pattern_id, effectiveness in self.pattern_effectiveness.items():
-            if effectiveness >= min_effectiveness and pattern_id in self.patterns:
-                pattern = self.patterns[pattern_id].copy()
-                pattern["effectiveness"] = effectiveness
-                pattern["usage_count"] = self.pattern_usage[pattern_id]
-                effective_patterns.append(pattern)
+        # O índice já está ordenado: basta percorrer o prefixo que atinge o limiar
+        for neg_effectiveness, _, pattern_id in self._by_effectiveness:
+            effectiveness = -neg_effectiveness
+            if effectiveness < min_effectiveness:
+                break
+            if pattern_id in self.patterns:
+                effective_patterns.append({
+                    **self.patterns[pattern_id],
+                    "effectiveness": effectiveness,
+                    "usage_count": self.pattern_usage[pattern_id]
+                })
         
-        return sorted(effective_patterns, key=lambda p: p["effectiveness"], reverse=True)
+        return effective_patterns
     
     def update_pattern_effectiveness(self, pattern_id: str, effectiveness: float) -> bool:
         """Atualiza a efetividade de um padrão"""
@@ -576,36 +724,60 @@ class EvolutionaryPatternLibrary:
             usage = self.pattern_usage[pattern_id]
             weight = 1.0 / (usage + 1)
             
-            self.pattern_effectiveness[pattern_id] = (current * (1 - weight)) + (effectiveness * weight)
+            self._set_effectiveness(pattern_id, (current * (1 - weight)) + (effectiveness * weight))
             return True
         return False
 
+    def _set_effectiveness(self, pattern_id: str, effectiveness: float) -> None:
+        """Atualiza a efetividade de um padrão e reposiciona-o no índice ordenado (O(log P) + deslocamento)"""
+        old_key = self._effectiveness_keys.get(pattern_id)
+        if old_key is not None:
+            del self._by_effectiveness[bisect.bisect_left(self._by_effectiveness, old_key)]
+            seq = old_key[1]
+        else:
+            seq = self._pattern_seq
+            self._pattern_seq += 1
+        key = (-effectiveness, seq, pattern_id)
+        bisect.insort(self._by_effectiveness, key)
+        self._effectiveness_keys[pattern_id] = key
+        self.pattern_effectiveness[pattern_id] = effectiveness
+
 
 class PerceptionActionInterface:
     """Interface de Percepção e Ação (IPA) - Permite interação com o ambiente externo"""
     
     def __init__(self):
-        self.input_buffer = []
-        self.output_history = []
+        # Entradas e saídas em colunas paralelas (ver propriedades input_buffer e output_history)
+        self.input_timestamps = array("d")
+        self.input_data = []
+        self.output_timestamps = array("d")
+        self.output_data = []
+        self._version = 0 # Incrementado a cada entrada/saída (invalida métricas em cache)
         logger.info("Interface de Percepção e Ação inicializada")
     
+    @property
+    def input_buffer(self) -> List[Dict[str, Any]]:
+        """Entradas recebidas como lista de registros {timestamp, data} (montada sob demanda)"""
+        return [{"timestamp": t, "data": d} for t, d in zip(self.input_timestamps, self.input_data)]
+    
+    @property
+    def output_history(self) -> List[Dict[str, Any]]:
+        """Saídas enviadas como lista de registros {timestamp, data} (montada sob demanda)"""
+        return [{"timestamp": t, "data": d} for t, d in zip(self.output_timestamps, self.output_data)]
+    
     def receive_input(self, input_data: Any) -> bool:
         """Recebe dados de entrada do ambiente"""
-        timestamp = time.time()
-        self.input_buffer.append({
-            "timestamp": timestamp,
-            "data": input_data
-        })
-        logger.debug(f"Entrada recebida: {input_data}")
+        self.input_timestamps.append(time.time())
+        self.input_data.append(input_data)
+        self._version += 1
+        logger.debug("Entrada recebida: %s", input_data)
         return True
     
     def send_output(self, output_data: Any) -> bool:
         """Envia dados para o ambiente"""
-        timestamp = time.time()
-        self.output_history.append({
-            "timestamp": timestamp,
-            "data": output_data
-        })
+        self.output_timestamps.append(time.time())
+        self.output_data.append(output_data)
+        self._version += 1
         
         # Exibe a saída no console
         if isinstance(output_data, str):
@@ -613,30 +785,118 @@ class PerceptionActionInterface:
         else:
             print(f"[AI-Genesis] Saída: {output_data}")
         
-        logger.debug(f"Saída enviada: {output_data}")
+        logger.debug("Saída enviada: %s", output_data)
         return True
     
     def get_metrics(self) -> Dict[str, float]:
         """Retorna métricas de desempenho"""
         return {
-            "input_count": len(self.input_buffer),
-            "output_count": len(self.output_history),
-            "last_interaction_time": self.output_history[-1]["timestamp"] if self.output_history else 0
+            "input_count": len(self.input_data),
+            "output_count": len(self.output_data),
+            "last_interaction_time": self.output_timestamps[-1] if self.output_timestamps else 0
         }
 
 
+def _audit_stats(timestamps: array, now: float) -> Tuple[float, float, int]:
+    """Calcula (duração, frequência por segundo, modificações na última hora)
+    sobre timestamps em ordem crescente, sem iterar em Python"""
+    if not timestamps:
+        return 0.0, 0.0, 0
+    duration = now - timestamps[0]
+    freq = len(timestamps) / duration if duration > 0 else 0.0
+    last_hour_count = len(timestamps) - bisect.bisect_left(timestamps, now - 3600)
+    return duration, freq, last_hour_count
+
+
+# Módulos cuja importação é considerada sensível pela verificação de segurança
+SENSITIVE_IMPORTS = frozenset({"socket", "subprocess", "ctypes", "shutil", "requests"})
+
+# Campos de um nó que contêm listas de instruções (importações e definições só aparecem como instruções)
+_STATEMENT_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+
+class _StatementVisitor(ast.NodeVisitor):
+    """Visitante que percorre apenas nós de instrução da AST (não desce em expressões)"""
+
+    def generic_visit(self, node: ast.AST) -> None:
+        for name in _STATEMENT_FIELDS:
+            for child in getattr(node, name, ()):
+                self.visit(child)
+
+
+class _CodeAnalyzer(_StatementVisitor):
+    """Conta classes, funções e importações para CodeTransformationEngine.analyze_code"""
+
+    def __init__(self):
+        self.classes = 0
+        self.functions = 0
+        self.imports = []
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.classes += 1
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self.functions += 1
+        self.generic_visit(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        self.imports.extend(alias.name for alias in node.names)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        self.imports.append(f"{node.module}")
+
+
+class _ImportScanner(_StatementVisitor):
+    """Coleta importações sensíveis percorrendo apenas nós de instrução da AST"""
+
+    def __init__(self, linenos: Optional[set] = None):
+        self.hits = []
+        self.linenos = linenos # Se informado, considera apenas importações nessas linhas
+
+    def _in_scope(self, node: ast.stmt) -> bool:
+        if self.linenos is None:
+            return True
+        return any(n in self.linenos for n in range(node.lineno, (node.end_lineno or node.lineno) + 1))
+
+    def visit_Import(self, node: ast.Import) -> None:
+        if self._in_scope(node):
+            self.hits.extend(alias.name for alias in node.names if alias.name in SENSITIVE_IMPORTS)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module in SENSITIVE_IMPORTS and self._in_scope(node):
+            self.hits.append(node.module)
+
+
 class SecurityLoggingMechanism:
     """Mecanismo de Segurança e Registro (MSR) - Mantém logs e garante segurança"""
     
     def __init__(self):
-        self.modification_log = []
-        self.security_violations = []
+        self.modification_log = deque(maxlen=AUDIT_LOG_MAXLEN)
+        self._mod_timestamps = array("d") # Timestamps das modificações (contíguos, para estatísticas)
+        self.total_modifications = 0 # Contagem total, independente da janela mantida em memória
+        self.security_violations = deque(maxlen=AUDIT_LOG_MAXLEN)
+        self.total_violations = 0
+        self._version = 0 # Incrementado a cada modificação/violação registrada (invalida métricas em cache)
         self.audit_trail = [] # Ainda não usado, mas planejado
+        self.audit_log_path = os.path.join(MODS_DIR, "audit.jsonl")
+        self._audit_fp = None # Aberto sob demanda e mantido aberto
+        self.io_executor = None # Se definido (pool de E/S do Core), os diffs são gravados em segundo plano
+        self._security_memo = OrderedDict() # (hash, is_modification, hash do original, com AST) -> resultado da análise
         logger.info("Mecanismo de Segurança e Registro inicializado")
     
-    def log_modification(self, component: str, description: str, code_before: str, code_after: str, cycle_id: int) -> str:
-        """Registra uma modificação no sistema"""
-        mod_id = hashlib.md5(f"{component}:{time.time()}".encode()).hexdigest()
+    def log_modification(self, component: str, description: str, code_before: str, code_after: str, cycle_id: int,
+                         hash_before: Optional[str] = None, hash_after: Optional[str] = None) -> str:
+        """Registra uma modificação no sistema
+
+        `hash_before`/`hash_after` (opcionais) são os hashes já conhecidos dos dois códigos;
+        quando omitidos, são calculados aqui.
+        """
+        mod_id = _content_hash(f"{component}:{time.time()}")
+        if hash_before is None:
+            hash_before = _content_hash(code_before)
+        if hash_after is None:
+            hash_after = _content_hash(code_after)
         
         modification = {
             "id": mod_id,
@@ -645,55 +905,138 @@ class SecurityLoggingMechanism:
             "component": component,
             "description": description,
             "code_diff_size": len(code_after) - len(code_before),
-            "hash_before": hashlib.md5(code_before.encode()).hexdigest(),
-            "hash_after": hashlib.md5(code_after.encode()).hexdigest()
+            "hash_before": hash_before,
+            "hash_after": hash_after
         }
         
         self.modification_log.append(modification)
-        
+        self.total_modifications += 1
+        self._version += 1
+        self._mod_timestamps.append(modification["timestamp"])
+        if len(self._mod_timestamps) > 2 * AUDIT_LOG_MAXLEN:
+            # Descarta a metade mais antiga de uma vez (cópia amortizada)
+            del self._mod_timestamps[:AUDIT_LOG_MAXLEN]
+        self._append_audit_entry(modification)
+
         # Salva o diff completo em um arquivo separado para auditoria
         try:
-            os.makedirs("mods", exist_ok=True)
-            diff_filename = f"mods/mod_{cycle_id}_{mod_id[:8]}.diff"
-            with open(diff_filename, "w") as f:
-                f.write(f"--- {component} (antes) Ciclo: {cycle_id}\n")
-                f.write(f"+++ {component} (depois) Ciclo: {cycle_id}\n")
-                f.write(f"Descrição: {description}\n\n")
+            _ensure_mods_dir()
+            diff_filename = os.path.join(MODS_DIR, f"mod_{cycle_id}_{mod_id[:8]}.diff")
+            payload = (
+                f"--- {component} (antes) Ciclo: {cycle_id}\n"
+                f"+++ {component} (depois) Ciclo: {cycle_id}\n"
+                f"Descrição: {description}\n\n"
                 # Idealmente, usaríamos uma biblioteca de diff aqui
-                f.write("Código antes (hash): " + modification["hash_before"] + "\n")
-                f.write("Código depois (hash): " + modification["hash_after"] + "\n")
+                f"Código antes (hash): {modification['hash_before']}\n"
+                f"Código depois (hash): {modification['hash_after']}\n"
                 # Poderia adicionar o diff real aqui se usasse difflib
+            ).encode("utf-8")
+            if self.io_executor is not None:
+                self.io_executor.submit(_write_bytes, diff_filename, payload)
+            else:
+                _write_bytes(diff_filename, payload)
         except Exception as e:
-            logger.error(f"Erro ao salvar diff da modificação {mod_id}: {e}")
+            logger.error("Erro ao salvar diff da modificação %s: %s", mod_id, e)
 
-        logger.info(f"Modificação registrada: {description} (ID: {mod_id}, Ciclo: {cycle_id})")
+        logger.info("Modificação registrada: %s (ID: %s, Ciclo: %s)", description, mod_id, cycle_id)
         return mod_id
-    
-    def check_security(self, code: str, is_modification: bool = False, original_code: str = None) -> Tuple[bool, str]:
+
+    def _append_audit_entry(self, entry: Dict[str, Any]) -> None:
+        """Acrescenta uma entrada ao registro de auditoria JSONL (arquivo mantido aberto)"""
+        try:
+            if self._audit_fp is None:
+                os.makedirs(os.path.dirname(self.audit_log_path), exist_ok=True)
+                self._audit_fp = open(self.audit_log_path, "ab")
+            # orjson (quando disponível) já retorna bytes, sem recodificação
+            self._audit_fp.write(_dumps(entry) + b"\n")
+            self._audit_fp.flush()
+        except Exception as e:
+            logger.error("Erro ao gravar entrada de auditoria %s: %s", entry.get("id"), e)
+
+    def check_security(self, code: str, is_modification: bool = False, original_code: str = None,
+                       tree: Optional[ast.AST] = None, code_hash: Optional[str] = None,
+                       original_hash: Optional[str] = None) -> Tuple[bool, str]:
         """Verifica se o código possui problemas de segurança
         
         Args:
             code: Código a ser verificado (completo após modificação)
             is_modification: Se True, verifica apenas as diferenças em relação ao código original
             original_code: Código original para comparação quando is_modification=True
+            tree: (Opcional) AST já obtida para `code`; evita um novo parse quando o código completo é analisado
+            code_hash: (Opcional) Hash já calculado de `code`
+            original_hash: (Opcional) Hash já calculado de `original_code`
+        """
+        # A análise é determinística: códigos já verificados reaproveitam o resultado,
+        # mas cada violação continua sendo registrada
+        if code_hash is None:
+            code_hash = _content_hash(code)
+        if not (is_modification and original_code):
+            original_hash = None
+        elif original_hash is None:
+            original_hash = _content_hash(original_code)
+        # Sem AST prévia, o trecho modificado pode ser analisado isoladamente, e não na AST completa:
+        # o resultado pode depender de a AST ter sido informada
+        memo_key = (code_hash, is_modification, original_hash, tree is not None)
+        result = self._security_memo.get(memo_key)
+        if result is None:
+            result = self._analyze_security(code, is_modification, original_code, tree, code_hash)
+            self._security_memo[memo_key] = result
+            if len(self._security_memo) > SECURITY_CHECK_MEMO_SIZE:
+                self._security_memo.popitem(last=False)
+        else:
+            self._security_memo.move_to_end(memo_key)
+            logger.debug("Resultado da verificação de segurança reaproveitado para %s", code_hash)
+
+        is_secure, message, violation_details = result
+        # Registra violações
+        if violation_details is not None:
+            issues, analysis_scope, code_hash_checked = violation_details
+            violation = {
+                "timestamp": time.time(),
+                "issues": list(issues),
+                "analysis_scope": analysis_scope,
+                "is_modification": is_modification,
+                "code_hash_checked": code_hash_checked
+            }
+            self.security_violations.append(violation)
+            self.total_violations += 1
+            self._version += 1
+            
+            logger.warning("Violação de segurança detectada: %s", violation["issues"])
+        return is_secure, message
+
+    def _analyze_security(self, code: str, is_modification: bool, original_code: Optional[str],
+                          tree: Optional[ast.AST], code_hash: str) -> Tuple[bool, str, Optional[Tuple[Tuple[str, ...], str, str]]]:
+        """Análise de check_security (sem memorização nem registro).
+
+        Returns:
+            Tupla (seguro, mensagem, detalhes da violação); os detalhes são
+            (problemas, escopo da análise, hash do trecho verificado) ou None se o código é seguro.
         """
         security_issues = []
+        changed_linenos = set()
         code_to_check = code # Por padrão, verifica o código inteiro
         analysis_scope = "Código completo"
 
         # Se for uma modificação, tenta analisar apenas o código novo/modificado
         if is_modification and original_code:
+            if code == original_code:
+                logger.debug("Código idêntico ao original; nada a verificar.")
+                return True, "Nenhuma modificação significativa detectada", None
             try:
-                # Usa difflib para encontrar as linhas adicionadas/modificadas
-                import difflib
-                d = difflib.Differ()
-                diff = list(d.compare(original_code.splitlines(keepends=True), code.splitlines(keepends=True)))
-                
-                new_or_changed_lines = [line[2:] for line in diff if line.startswith("+ ") or line.startswith("? ")]
+                # Linhas adicionadas/modificadas: as que não existem em parte alguma do código original
+                # (conjunto de linhas, O(N+M), em vez do alinhamento O(N·M) do difflib)
+                original_lines = set(original_code.splitlines())
+                new_or_changed_lines = []
+                # Números das linhas adicionadas no código novo, para filtrar a AST completa
+                for new_lineno, line in enumerate(code.splitlines(keepends=True), 1):
+                    if line.rstrip("\r\n") not in original_lines:
+                        new_or_changed_lines.append(line)
+                        changed_linenos.add(new_lineno)
                 
                 if not new_or_changed_lines:
                     logger.debug("Nenhuma linha nova ou modificada detectada pela análise de diff.")
-                    return True, "Nenhuma modificação significativa detectada"
+                    return True, "Nenhuma modificação significativa detectada", None
                     
                 code_to_check = "".join(new_or_changed_lines)
                 analysis_scope = f"Código modificado ({len(new_or_changed_lines)} linhas)"
@@ -703,86 +1046,149 @@ class SecurityLoggingMechanism:
                 code_to_check = code # Fallback para código completo
                 analysis_scope = "Código completo (fallback)"
         
-        # Verificações básicas de segurança
-        dangerous_patterns = [
-            ("os.system(", "Chamada direta ao sistema"),
-            ("subprocess.call(", "Chamada de subprocesso"),
-            ("subprocess.run(", "Chamada de subprocesso"),
-            ("eval(", "Uso de eval"),
-            ("exec(", "Uso de exec"),
-            ("__import__(", "Importação dinâmica")
-            # Removido 'open(' pois é necessário para logs e arquivos de configuração
-        ]
-        
-        for pattern, issue in dangerous_patterns:
-            if pattern in code_to_check:
+        # Verificações básicas de segurança (uma passada; cada padrão é relatado uma vez)
+        found_patterns = set(_DANGEROUS_RE.findall(code_to_check))
+        for pattern, issue in _DANGEROUS_PATTERNS:
+            if pattern in found_patterns:
                 security_issues.append(f"Padrão potencialmente perigoso: {issue} (detectado em {analysis_scope})")
         
         # Verifica importações suspeitas no código modificado
         try:
-            # Tenta parsear apenas o trecho modificado, pode falhar se for incompleto
-            tree = ast.parse(code_to_check)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for name in node.names:
-                        if name.name in ["socket", "subprocess", "ctypes", "shutil", "requests"]:
-                            security_issues.append(f"Importação sensível: {name.name} (detectado em {analysis_scope})")
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module in ["socket", "subprocess", "ctypes", "shutil", "requests"]:
-                        security_issues.append(f"Importação sensível: {node.module} (detectado em {analysis_scope})")
+            if tree is not None and code_to_check is not code:
+                # Reaproveita a AST do código completo, restrita às linhas adicionadas
+                scanner = _ImportScanner(changed_linenos)
+            elif code_to_check is not code:
+                try:
+                    # Sem AST prévia, tenta parsear apenas o trecho modificado
+                    tree = ast.parse(code_to_check, **_PARSE_KWARGS)
+                    scanner = _ImportScanner()
+                except SyntaxError:
+                    # Trecho incompleto (ex.: linhas indentadas de um método novo): parseia o código
+                    # completo e considera apenas as linhas adicionadas
+                    tree = ast.parse(code, **_PARSE_KWARGS)
+                    scanner = _ImportScanner(changed_linenos)
+            else:
+                if tree is None:
+                    tree = ast.parse(code_to_check, **_PARSE_KWARGS)
+                scanner = _ImportScanner()
+            scanner.visit(tree)
+            for module_name in scanner.hits:
+                security_issues.append(f"Importação sensível: {module_name} (detectado em {analysis_scope})")
         except SyntaxError:
-             logger.warning(f"Não foi possível fazer parse AST do trecho modificado para análise de segurança. Análise de importações incompleta.")
+             logger.warning("Não foi possível fazer parse AST do código modificado para análise de segurança. Análise de importações incompleta.")
         except Exception as e:
             logger.error(f"Erro inesperado na análise AST de segurança: {e}")
         
-        # Registra violações
         if security_issues:
-            violation = {
-                "timestamp": time.time(),
-                "issues": security_issues,
-                "analysis_scope": analysis_scope,
-                "is_modification": is_modification,
-                "code_hash_checked": hashlib.md5(code_to_check.encode()).hexdigest()
-            }
-            self.security_violations.append(violation)
-            
-            logger.warning(f"Violação de segurança detectada: {security_issues}")
-            return False, "\n".join(security_issues)
+            code_hash_checked = code_hash if code_to_check is code else _content_hash(code_to_check)
+            return False, "\n".join(security_issues), (tuple(security_issues), analysis_scope, code_hash_checked)
         
         logger.info(f"Verificação de segurança concluída ({analysis_scope}): Código seguro")
-        return True, "Código seguro"
+        return True, "Código seguro", None
     
     def get_audit_report(self) -> Dict[str, Any]:
         """Gera um relatório de auditoria"""
-        first_mod_time = self.modification_log[0]["timestamp"] if self.modification_log else time.time()
-        duration = time.time() - first_mod_time
-        mod_freq = len(self.modification_log) / duration if duration > 0 else 0
+        _, mod_freq, last_hour_count = _audit_stats(self._mod_timestamps, time.time())
 
         return {
-            "total_modifications": len(self.modification_log),
-            "security_violations_count": len(self.security_violations),
+            "total_modifications": self.total_modifications,
+            "security_violations_count": self.total_violations,
             "last_modification": self.modification_log[-1] if self.modification_log else None,
             "last_violation": self.security_violations[-1] if self.security_violations else None,
-            "modification_frequency_per_hour": mod_freq * 3600
+            "modification_frequency_per_hour": mod_freq * 3600,
+            "modifications_last_hour": last_hour_count
         }
     
     def get_metrics(self) -> Dict[str, float]:
         """Retorna métricas de segurança"""
         return {
-            "modifications": len(self.modification_log),
-            "violations": len(self.security_violations)
+            "modifications": self.total_modifications,
+            "violations": self.total_violations
         }
 
 
 # --- Núcleo Principal AI-Genesis --- 
 
+MODS_DIR = "mods" # Diretório dos registros de modificações, diffs e logs de ciclo
+_mods_dir_ready = False
+
+def _ensure_mods_dir() -> None:
+    """Cria o diretório de registros uma única vez por processo"""
+    global _mods_dir_ready
+    if not _mods_dir_ready:
+        os.makedirs(MODS_DIR, exist_ok=True)
+        _mods_dir_ready = True
+
+@functools.lru_cache(maxsize=1)
+def _cached_source_code() -> str:
+    """Código-fonte deste módulo, lido do disco uma única vez por processo"""
+    return pathlib.Path(__file__).read_text(encoding="utf-8")
+
+def _write_bytes(path: str, payload: bytes) -> None:
+    """Grava bytes em um arquivo de forma atômica (executado no pool de E/S do Core):
+    escreve em um temporário ao lado do destino e o renomeia com os.replace, de modo que
+    uma interrupção nunca deixe um snapshot ou diff parcialmente gravado.
+    O payload já está pronto em memória: é gravado direto no descritor, sem a camada de buffer do io"""
+    tmp_path = f"{path}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0), 0o644)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+        logger.info("Arquivo salvo em %s", path)
+    except Exception as e:
+        logger.error("Erro ao salvar %s: %s", path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+def _write_compressed_diff(path: str, code_before: str, code_after: str, cycle_id: int, base_cycle_id: int) -> None:
+    """Calcula o diff unificado entre duas versões do código e o grava comprimido com zlib.
+    `base_cycle_id` é o ciclo que produziu `code_before` (0 = código original)"""
+    diff = "".join(difflib.unified_diff(
+        code_before.splitlines(keepends=True),
+        code_after.splitlines(keepends=True),
+        fromfile=f"c{base_cycle_id}",
+        tofile=f"c{cycle_id}"
+    ))
+    _write_bytes(path, zlib.compress(diff.encode("utf-8"), 1))
+
+
+@dataclass(slots=True) # slots=True exige Python 3.10+ (versão mínima do projeto)
+class CycleResult:
+    """Resultado de um ciclo de evolução (serializado como um registro em cycles.jsonl)"""
+    cycle_id: int
+    start_time: float
+    modifications: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    metrics: Dict[str, float] = field(default_factory=dict)
+    hypothesis_generated: bool = False
+    hypotheses_count: int = 0
+    selected_hypothesis: Optional[Dict[str, Any]] = None
+    modification_description: Optional[str] = None
+    code_generated: bool = False
+    security_check_msg: Optional[str] = None
+    security_passed: bool = False
+    syntax_passed: bool = False
+    modification_applied: bool = False
+    info: Optional[str] = None
+    end_time: Optional[float] = None
+    duration_s: Optional[float] = None
+    run_id: Optional[str] = None # Execução que gerou o ciclo (cycle_id recomeça em 1 a cada execução)
+
+
 class AIGenesisCore:
     """Núcleo principal do AI-Genesis - Coordena todos os componentes"""
     
     def __init__(self):
         logger.info("Inicializando AI-Genesis Core...")
         # Cria diretório para logs de modificações
-        os.makedirs("mods", exist_ok=True)
+        _ensure_mods_dir()
         
         # Inicializa componentes
         self.meta_cognition = MetaCognitionCore()
@@ -807,22 +1213,124 @@ class AIGenesisCore:
         
         # Estado do sistema
         self.evolution_cycles = 0
+        self._last_modified_cycle = 0 # Ciclo que produziu o código corrente (0 = original)
+        self._diffs_since_snapshot = 0 # Diffs gravados desde a última cópia completa
+        self.run_id = time.strftime("%Y%m%dT%H%M%S") # Identifica esta execução em cycles.jsonl e nos arquivos de mods/
         self.running = False # Controla o loop de evolução manual
-        self.source_code = None
+        self._stop_event = threading.Event() # Sinaliza a interrupção da evolução manual
+        self._evolution_lock = threading.Lock() # Serializa ciclos (thread da consciência x evolução manual)
+        self._source_cache = OrderedDict() # hash -> AST (LRU de SOURCE_CACHE_SIZE versões)
+        self._source_code = None
+        self.source_hash = None
+        self.source_tree = None
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-genesis-io") # Gravações fora do ciclo
+        self.security.io_executor = self._io_pool
+        self.cycle_log_path = os.path.join(MODS_DIR, "cycles.jsonl") # Um registro JSON por linha, só acréscimo
+        self._cycle_log = None # Aberto sob demanda; usado apenas pela thread de E/S
+        self._cycle_log_pending = 0
+        self.dump_cycle_json = False # Se True, grava também cycle_{id}.json legível (modo --verbose)
         self.last_evolution_result = None
+        self.evolution_task = None # Tarefa asyncio da evolução manual em segundo plano (modo interativo)
+        self.min_cycle_gap_s = 1.0 # Intervalo mínimo (s) entre inícios de ciclos manuais; 0 desativa a pausa
+        self._cons_status_cache = (0.0, None) # (instante monotônico, status)
+        self._metrics_cache = (0.0, None) # (instante monotônico, métricas); invalidado a cada ciclo
         
         # Carrega o código-fonte inicial
         try:
-            with open(__file__, "r") as f:
-                self.source_code = f.read()
-            logger.info(f"Código fonte inicial carregado ({len(self.source_code)} bytes)")
+            self.source_code = _cached_source_code()
+            logger.info("Código fonte inicial carregado (%d bytes)", len(self.source_code))
         except Exception as e:
-            logger.error(f"Erro crítico ao carregar código-fonte: {e}")
+            logger.error("Erro crítico ao carregar código-fonte: %s", e)
             self.source_code = "" # Evita falha total
         
         logger.info("AI-Genesis Core inicializado com sucesso")
         self.interface.send_output("AI-Genesis Core pronto.")
 
+    def shutdown(self) -> None:
+        """Aguarda as gravações pendentes em segundo plano e libera o pool de E/S"""
+        self._io_pool.submit(self._close_cycle_log)
+        self._io_pool.shutdown(wait=True)
+
+    def _write_file_async(self, path: str, payload: bytes) -> None:
+        """Agenda a gravação de `payload` em `path` no pool de E/S"""
+        self._io_pool.submit(_write_bytes, path, payload)
+
+    def _append_cycle_record(self, payload: bytes) -> None:
+        """Acrescenta um registro ao log de ciclos (executado na thread de E/S)"""
+        try:
+            if self._cycle_log is None:
+                os.makedirs(os.path.dirname(self.cycle_log_path), exist_ok=True)
+                self._cycle_log = open(self.cycle_log_path, "ab", buffering=1 << 16)
+            self._cycle_log.write(payload + b"\n")
+            self._cycle_log_pending += 1
+            if self._cycle_log_pending >= CYCLE_LOG_FLUSH_INTERVAL:
+                self._cycle_log.flush()
+                self._cycle_log_pending = 0
+        except Exception as e:
+            logger.error("Erro ao gravar registro de ciclo em %s: %s", self.cycle_log_path, e)
+
+    def _close_cycle_log(self) -> None:
+        """Descarrega e fecha o log de ciclos (executado na thread de E/S)"""
+        if self._cycle_log is not None:
+            self._cycle_log.close()
+            self._cycle_log = None
+            self._cycle_log_pending = 0
+
+    def _save_evolved_code(self, cycle_id: int, code_before: str, code_after: str) -> None:
+        """Registra o código evoluído em segundo plano, em MODS_DIR e com o run_id no nome
+        (cycle_id recomeça em 1 a cada execução): cópia completa do código base na primeira
+        modificação da execução (core_evolved_{run}_c0.py), diff unificado comprimido a cada
+        modificação ({run}_c{id}.diff.z) e nova cópia completa a cada EVOLVED_SNAPSHOT_INTERVAL
+        diffs aplicados. A cadeia de cada execução pode assim ser reconstruída a partir da base."""
+        if self._last_modified_cycle == 0: # Primeira modificação desta execução
+            self._write_file_async(os.path.join(MODS_DIR, f"core_evolved_{self.run_id}_c0.py"), code_before.encode())
+        self._io_pool.submit(_write_compressed_diff, os.path.join(MODS_DIR, f"{self.run_id}_c{cycle_id}.diff.z"),
+                             code_before, code_after, cycle_id, self._last_modified_cycle)
+        self._last_modified_cycle = cycle_id
+        # Conta diffs, não ciclos: ciclos sem modificação não chegam aqui
+        self._diffs_since_snapshot += 1
+        if self._diffs_since_snapshot >= EVOLVED_SNAPSHOT_INTERVAL:
+            self._diffs_since_snapshot = 0
+            self._write_file_async(os.path.join(MODS_DIR, f"core_evolved_{self.run_id}_c{cycle_id}.py"),
+                                   code_after.encode())
+
+    # --- Código-Fonte Corrente (com cache de AST/hash) ---
+
+    @property
+    def source_code(self) -> Optional[str]:
+        return self._source_code
+
+    @source_code.setter
+    def source_code(self, code: Optional[str]) -> None:
+        self._set_source(code)
+
+    def _set_source(self, code: Optional[str]) -> None:
+        """Atualiza o código-fonte corrente, reaproveitando AST e hash já calculados"""
+        self._source_code = code
+        if code:
+            self.source_tree, self.source_hash = self._parse_source(code)
+        else:
+            self.source_tree, self.source_hash = None, None
+
+    def _parse_source(self, code: str) -> Tuple[Optional[ast.AST], str]:
+        """Retorna (AST, hash) de um código, consultando o cache LRU antes de parsear.
+        A AST é None se o código for sintaticamente inválido."""
+        code_hash = _content_hash(code)
+        if code_hash in self._source_cache:
+            self._source_cache.move_to_end(code_hash)
+            return self._source_cache[code_hash], code_hash
+
+        try:
+            tree = ast.parse(code, **_PARSE_KWARGS)
+        except SyntaxError as e:
+            logger.debug("Código não pôde ser parseado para o cache: %s", e)
+            tree = None
+
+        self._source_cache[code_hash] = tree
+        if len(self._source_cache) > SOURCE_CACHE_SIZE:
+            self._source_cache.popitem(last=False)
+        return tree, code_hash
+
     # --- Métodos de Controle da Consciência --- 
 
     def activate_consciousness(self):
@@ -831,11 +1339,18 @@ class AIGenesisCore:
              logger.error("Módulo de Consciência não pôde ser importado. Ativação falhou.")
              self.interface.send_output("Erro: Módulo de Consciência não disponível.")
              return False
+        
+        if self.manual_evolution_in_progress():
+            # O loop de consciência também executa ciclos de evolução: os dois não podem rodar juntos
+            logger.warning("Ativação da consciência recusada: evolução manual em andamento.")
+            self.interface.send_output("Evolução manual em andamento. Use 'stop' antes de ativar a consciência.")
+            return False
              
         if not self.consciousness:
             logger.info("Ativando Módulo de Consciência Autônoma...")
             self.consciousness = ConsciousnessModule(self) # Passa referência do Core
             self.components["consciousness"] = self.consciousness # Atualiza registro
+            self._cons_status_cache = (0.0, None)
             if self.consciousness.start_consciousness_loop():
                 self.interface.send_output("Módulo de Consciência Autônoma ativado.")
                 return True
@@ -857,6 +1372,7 @@ class AIGenesisCore:
             if self.consciousness.stop_consciousness_loop():
                  self.consciousness = None
                  self.components["consciousness"] = None # Atualiza registro
+                 self._cons_status_cache = (0.0, None)
                  self.interface.send_output("Módulo de Consciência Autônoma desativado.")
                  return True
             else:
@@ -868,89 +1384,110 @@ class AIGenesisCore:
             self.interface.send_output("Módulo de Consciência não está ativo.")
             return False
 
+    def get_system_metrics(self) -> Dict[str, float]:
+        """Avalia as métricas dos componentes (em cache por SYSTEM_METRICS_TTL_S ou até o próximo ciclo).
+        Não altera o histórico de avaliações: pode rodar durante um ciclo em segundo plano."""
+        now = time.monotonic()
+        cached_at, metrics = self._metrics_cache
+        if metrics is not None and now - cached_at < SYSTEM_METRICS_TTL_S:
+            return metrics
+        metrics = self.meta_cognition.evaluate_system(self.components, record=False)
+        self._metrics_cache = (now, metrics)
+        return metrics
+
     def get_consciousness_status(self) -> Dict[str, Any]:
-        """Retorna o status do módulo de consciência"""
+        """Retorna o status do módulo de consciência (em cache por CONSCIOUSNESS_STATUS_TTL_S)"""
         if not self.consciousness:
             return {"active": False, "status": "Inativo ou não disponível"}
         
+        now = time.monotonic()
+        cached_at, status = self._cons_status_cache
+        if status is not None and now - cached_at < CONSCIOUSNESS_STATUS_TTL_S:
+            return status
+        
         # Delega a busca de status para o próprio módulo se ele tiver um método
         if hasattr(self.consciousness, "get_status_summary"):
-             return self.consciousness.get_status_summary()
-             
-        # Fallback básico
-        return {
-            "active": self.consciousness.active,
-            "decisions_made": len(self.consciousness.decision_history),
-            "last_reflection_ago_s": time.time() - self.consciousness.last_reflection_time if self.consciousness.last_reflection_time else -1,
-            "thread_alive": self.consciousness.thread.is_alive() if self.consciousness.thread else False
-        }
+             status = self.consciousness.get_status_summary()
+        else:
+            # Fallback básico
+            consciousness = self.consciousness
+            status = {
+                "active": consciousness.active,
+                "decisions_made": len(consciousness.decision_history),
+                "last_reflection_ago_s": time.time() - consciousness.last_reflection_time if consciousness.last_reflection_time else -1,
+                "thread_alive": consciousness.thread.is_alive() if consciousness.thread else False
+            }
+        self._cons_status_cache = (now, status)
+        return status
 
     # --- Ciclo de Evolução (pode ser chamado manualmente ou pela consciência) --- 
     
-    def run_evolution_cycle(self) -> Dict[str, Any]:
-        """Executa um ciclo completo de evolução"""
+    def run_evolution_cycle(self) -> CycleResult:
+        """Executa um ciclo completo de evolução (um ciclo por vez, qualquer que seja a thread chamadora)"""
+        with self._evolution_lock:
+            return self._run_evolution_cycle()
+
+    def _run_evolution_cycle(self) -> CycleResult:
         cycle_start_time = time.time()
         current_cycle_id = self.evolution_cycles + 1
-        logger.info(f"--- Iniciando Ciclo de Evolução Manual #{current_cycle_id} ---")
+        logger.info("--- Iniciando Ciclo de Evolução Manual #%d ---", current_cycle_id)
         self.interface.send_output(f"Iniciando ciclo de evolução #{current_cycle_id}")
         
-        cycle_results = {
-            "cycle_id": current_cycle_id,
-            "start_time": cycle_start_time,
-            "modifications": [],
-            "errors": [],
-            "hypothesis_generated": False,
-            "hypothesis_selected": None,
-            "code_generated": False,
-            "security_passed": False,
-            "syntax_passed": False,
-            "modification_applied": False
-        }
+        cycle_results = CycleResult(cycle_id=current_cycle_id, start_time=cycle_start_time, run_id=self.run_id)
         
         try:
             # 1. Avaliação do sistema atual
             metrics = self.meta_cognition.evaluate_system(self.components)
-            cycle_results["metrics"] = metrics
+            cycle_results.metrics = metrics
             
             # 2. Geração de hipóteses de melhoria
             hypotheses = self.meta_cognition.generate_improvement_hypotheses()
-            cycle_results["hypotheses_count"] = len(hypotheses)
-            cycle_results["hypothesis_generated"] = bool(hypotheses)
+            cycle_results.hypotheses_count = len(hypotheses)
+            cycle_results.hypothesis_generated = bool(hypotheses)
             
             if hypotheses:
-                # Seleciona a hipótese de maior prioridade
-                hypothesis = sorted(hypotheses, key=lambda h: h.get("priority", 0), reverse=True)[0]
-                cycle_results["selected_hypothesis"] = hypothesis
-                logger.info(f"Hipótese selecionada: {hypothesis.get('type')} para {hypothesis.get('target')}")
+                # Seleciona a hipótese de maior prioridade (passagem única; em empate, a primeira)
+                hypothesis = max(hypotheses, key=lambda h: h.get("priority", 0))
+                cycle_results.selected_hypothesis = hypothesis
+                logger.info("Hipótese selecionada: %s para %s", hypothesis.get("type"), hypothesis.get("target"))
                 
                 # 3. Transformação de código
                 if self.source_code:
                     modified_code, description = self.code_transformer.generate_code_modification(
-                        self.source_code, hypothesis
+                        self.source_code, hypothesis, tree=self.source_tree
                     )
-                    cycle_results["modification_description"] = description
+                    cycle_results.modification_description = description
                     
                     # Verifica se houve realmente uma modificação
                     if modified_code != self.source_code:
-                        cycle_results["code_generated"] = True
+                        cycle_results.code_generated = True
                         logger.info("Código modificado gerado.")
+                        # Parse/hash únicos do código modificado, reaproveitados pelas verificações
+                        # e pela aplicação da modificação (via cache de código-fonte)
+                        modified_tree, modified_hash = self._parse_source(modified_code)
                         
-                        # 4. Teste de segurança (agora passa o código original)
-                        is_secure, security_msg = self.security.check_security(
-                            modified_code, 
-                            is_modification=True, 
-                            original_code=self.source_code
-                        )
-                        cycle_results["security_check_msg"] = security_msg
+                        if modified_tree is None:
+                            # O parse único já falhou: o código é inválido e a verificação de segurança é dispensada
+                            error_msg = "Código modificado é sintaticamente inválido"
+                            logger.error(error_msg)
+                            cycle_results.errors.append(error_msg)
+                        else:
+                            # 4. Teste de segurança (agora passa o código original)
+                            is_secure, security_msg = self.security.check_security(
+                                modified_code, 
+                                is_modification=True, 
+                                original_code=self.source_code,
+                                tree=modified_tree,
+                                code_hash=modified_hash,
+                                original_hash=self.source_hash
+                            )
+                            cycle_results.security_check_msg = security_msg
                         
-                        if is_secure:
-                            cycle_results["security_passed"] = True
-                            logger.info("Verificação de segurança passou.")
-                            # 5. Teste de validade sintática
-                            is_valid = self.code_transformer.test_modified_code(modified_code)
-                            
-                            if is_valid:
-                                cycle_results["syntax_passed"] = True
+                            if is_secure:
+                                cycle_results.security_passed = True
+                                logger.info("Verificação de segurança passou.")
+                                # 5. Validade sintática: já garantida pelo parse único acima (modified_tree)
+                                cycle_results.syntax_passed = True
                                 logger.info("Verificação de sintaxe passou.")
                                 # 6. Registro da modificação
                                 mod_id = self.security.log_modification(
@@ -958,119 +1495,143 @@ class AIGenesisCore:
                                     description,
                                     self.source_code,
                                     modified_code,
-                                    current_cycle_id # Passa o ID do ciclo
+                                    current_cycle_id, # Passa o ID do ciclo
+                                    hash_before=self.source_hash,
+                                    hash_after=modified_hash
                                 )
-                                
+                            
                                 # 7. Aplicação da modificação
+                                self._save_evolved_code(current_cycle_id, self.source_code, modified_code)
                                 self.source_code = modified_code
-                                cycle_results["modification_applied"] = True
-                                cycle_results["modifications"].append({
+                                cycle_results.modification_applied = True
+                                cycle_results.modifications.append({
                                     "mod_id": mod_id,
                                     "description": description,
                                     "target": hypothesis.get("target", "system")
                                 })
-                                logger.info(f"Modificação aplicada: {description}")
+                                logger.info("Modificação aplicada: %s", description)
                                 self.interface.send_output(f"Modificação aplicada: {description}")
-                                
-                                # Tenta salvar o novo código (opcional, pode ser pesado)
-                                try:
-                                     evolved_filename = f"core_evolved_c{current_cycle_id}.py"
-                                     with open(evolved_filename, "w") as f:
-                                         f.write(modified_code)
-                                     logger.info(f"Código evoluído salvo em {evolved_filename}")
-                                except Exception as e:
-                                     logger.error(f"Erro ao salvar código evoluído: {e}")
-
                             else:
-                                error_msg = "Código modificado é sintaticamente inválido"
+                                error_msg = f"Violação de segurança: {security_msg}"
                                 logger.error(error_msg)
-                                cycle_results["errors"].append(error_msg)
-                        else:
-                            error_msg = f"Violação de segurança: {security_msg}"
-                            logger.error(error_msg)
-                            cycle_results["errors"].append(error_msg)
+                                cycle_results.errors.append(error_msg)
                     else:
                         # Nenhuma modificação gerada ou a modificação era idêntica
                         info_msg = "Nenhuma modificação significativa gerada pelo transformador."
                         logger.info(info_msg)
                         # Não consideramos isso um erro, apenas um ciclo sem progresso
-                        cycle_results["info"] = info_msg 
+                        cycle_results.info = info_msg 
                 else:
                      error_msg = "Código fonte não disponível para modificação."
                      logger.error(error_msg)
-                     cycle_results["errors"].append(error_msg)
+                     cycle_results.errors.append(error_msg)
             else:
                 info_msg = "Nenhuma hipótese de melhoria gerada neste ciclo."
                 logger.info(info_msg)
-                cycle_results["info"] = info_msg
+                cycle_results.info = info_msg
         
         except Exception as e:
             error_msg = f"Erro inesperado no ciclo de evolução: {str(e)}"
             logger.error(error_msg, exc_info=True)
-            cycle_results["errors"].append(error_msg)
+            cycle_results.errors.append(error_msg)
         
         # Finaliza o ciclo
         cycle_end_time = time.time()
-        cycle_results["end_time"] = cycle_end_time
-        cycle_results["duration_s"] = cycle_end_time - cycle_start_time
+        cycle_results.end_time = cycle_end_time
+        cycle_results.duration_s = cycle_end_time - cycle_start_time
         
         self.evolution_cycles += 1
         self.last_evolution_result = cycle_results # Guarda o resultado do último ciclo
+        self._metrics_cache = (0.0, None)
         
-        # Registra resultados do ciclo em JSON
+        # Acrescenta os resultados do ciclo ao log JSONL (serializa agora, grava em segundo plano)
         try:
-            cycle_log_filename = f"cycle_{current_cycle_id}.json"
-            with open(cycle_log_filename, "w") as f:
-                # Usa json.dumps com indentação para melhor leitura
-                f.write(json.dumps(cycle_results, indent=2, default=str)) # default=str para lidar com tipos não serializáveis
-            logger.info(f"Resultados do ciclo salvos em {cycle_log_filename}")
+            self._io_pool.submit(self._append_cycle_record, _dumps(cycle_results))
+            if self.dump_cycle_json:
+                self._write_file_async(f"cycle_{current_cycle_id}.json", _dumps_pretty(cycle_results))
         except Exception as e:
-            logger.error(f"Erro ao salvar resultados do ciclo {current_cycle_id}: {e}")
+            logger.error("Erro ao serializar resultados do ciclo %d: %s", current_cycle_id, e)
 
         # Relatório resumido
-        summary = f"Ciclo {current_cycle_id} concluído em {cycle_results['duration_s']:.2f}s. "
-        if cycle_results["modification_applied"]:
-            summary += f"Modificação aplicada: {cycle_results['modifications'][0]['description']}."
-        elif cycle_results["errors"]:
-            summary += f"Erro(s): {'; '.join(cycle_results['errors'])}."
+        if cycle_results.modification_applied:
+            outcome = f"Modificação aplicada: {cycle_results.modifications[0]['description']}."
+        elif cycle_results.errors:
+            errors = cycle_results.errors
+            # Caso comum: um único erro, exibido sem passar por join
+            outcome = f"Erro(s): {errors[0] if len(errors) == 1 else '; '.join(errors)}."
         else:
-            summary += "Nenhuma modificação aplicada."
-        self.interface.send_output(summary)
-        logger.info(f"--- Fim do Ciclo de Evolução Manual #{current_cycle_id} ---")
+            outcome = "Nenhuma modificação aplicada."
+        self.interface.send_output(f"Ciclo {current_cycle_id} concluído em {cycle_results.duration_s:.2f}s. {outcome}")
+        logger.info("--- Fim do Ciclo de Evolução Manual #%d ---", current_cycle_id)
         return cycle_results
     
     # --- Controle Manual de Evolução --- 
 
     def start_manual_evolution(self, cycles: int = 1) -> None:
-        """Inicia o processo evolutivo manual por N ciclos"""
-        if self.consciousness and self.consciousness.active:
-             logger.warning("Evolução manual solicitada enquanto a consciência está ativa. Desativando consciência primeiro.")
-             self.deactivate_consciousness()
-             time.sleep(1) # Pequena pausa para garantir a desativação
-             
+        """Inicia o processo evolutivo manual por N ciclos (bloqueia até concluir ou ser interrompido)"""
+        asyncio.run(self.start_manual_evolution_async(cycles))
+
+    async def start_manual_evolution_async(self, cycles: int = 1) -> None:
+        """Executa o processo evolutivo manual por N ciclos como corrotina.
+
+        Cada ciclo roda em uma thread auxiliar e a pausa entre ciclos é uma espera
+        interrompível em `_stop_event`, de modo que `stop_manual_evolution` tem efeito imediato.
+        Use `submit_manual_evolution(n)` para rodar em segundo plano.
+        """
+        # Em andamento desde antes do primeiro await: um stop/exit durante a desativação da
+        # consciência sinaliza o evento e é atendido no início do laço
         self.running = True
-        logger.info(f"Iniciando evolução manual por {cycles} ciclos...")
-        self.interface.send_output(f"Iniciando evolução manual por {cycles} ciclos...")
-        
-        for i in range(cycles):
-            if not self.running:
-                logger.info("Evolução manual interrompida.")
-                break
+        try:
+            if self.consciousness and self.consciousness.active:
+                 logger.warning("Evolução manual solicitada enquanto a consciência está ativa. Desativando consciência primeiro.")
+                 await asyncio.to_thread(self.deactivate_consciousness) # O join da thread pode levar segundos
+                 # Pequena pausa para garantir a desativação (interrompível pelo evento de parada)
+                 await asyncio.to_thread(self._stop_event.wait, 1)
+                 
+            logger.info("Iniciando evolução manual por %d ciclos...", cycles)
+            self.interface.send_output(f"Iniciando evolução manual por {cycles} ciclos...")
+            
+            for i in range(cycles):
+                if self._stop_event.is_set():
+                    logger.info("Evolução manual interrompida.")
+                    break
                 
-            self.run_evolution_cycle()
+                result = await asyncio.to_thread(self.run_evolution_cycle)
             
-            # Pausa entre ciclos manuais (opcional)
-            if i < cycles - 1 and self.running:
-                time.sleep(1)
-        
-        self.running = False
-        logger.info("Evolução manual concluída.")
-        self.interface.send_output("Evolução manual concluída.")
+                # Pausa entre ciclos manuais: completa o intervalo mínimo contado do início do ciclo
+                # (interrompida assim que o evento de parada é sinalizado)
+                pause = max(0.0, self.min_cycle_gap_s - result.duration_s)
+                if i < cycles - 1 and pause and await asyncio.to_thread(self._stop_event.wait, pause):
+                    logger.info("Evolução manual interrompida.")
+                    break
+        finally:
+            # Também em cancelamento ou exceção, para não deixar `running` preso em True; a parada
+            # já atendida é consumida aqui, e não no início, para não descartar um stop antecipado
+            self.running = False
+            self._stop_event.clear()
+            logger.info("Evolução manual concluída.")
+            self.interface.send_output("Evolução manual concluída.")
     
+    def manual_evolution_in_progress(self) -> bool:
+        """True enquanto houver evolução manual em execução ou agendada (tarefa ainda não concluída)"""
+        task = self.evolution_task
+        return self.running or (task is not None and not task.done())
+
+    def submit_manual_evolution(self, cycles: int = 1) -> Optional["asyncio.Task[None]"]:
+        """Agenda a evolução manual por N ciclos como tarefa do loop de eventos corrente (não bloqueia).
+        Retorna None, sem agendar, se já houver uma evolução em andamento."""
+        if self.manual_evolution_in_progress():
+            logger.warning("Evolução manual já em andamento; nova solicitação ignorada.")
+            return None
+        self._stop_event.clear() # Nenhuma evolução em andamento: qualquer sinal pendente é antigo
+        self.evolution_task = asyncio.create_task(self.start_manual_evolution_async(cycles))
+        return self.evolution_task
+
     def stop_manual_evolution(self) -> None:
-        """Para o processo evolutivo manual"""
-        if self.running:
-            self.running = False
+        """Para o processo evolutivo manual (também se a tarefa ainda não começou a executar);
+        `running` volta a False quando a evolução de fato termina"""
+        if self.manual_evolution_in_progress():
+            self._stop_event.set()
             logger.info("Parando evolução manual...")
             self.interface.send_output("Evolução manual interrompida.")
         else:
@@ -1079,132 +1640,241 @@ class AIGenesisCore:
 
 # --- Bloco Principal de Execução --- 
 
+# --- Comandos do modo interativo ---
+
+BANNER = "\n".join([
+    "=" * 60,
+    "  AI-Genesis Core - Sistema minimalista auto-evolutivo",
+    "  Desenvolvido por Zylar de Xylos",
+    "=" * 60,
+])
+
+INTERACTIVE_HELP = """
+Modo interativo iniciado. Comandos disponíveis:
+  evolve N  - Executa N ciclos de evolução manual
+  stop      - Para a evolução manual em andamento
+  status    - Exibe status geral e métricas
+  conscience activate   - Ativa o Módulo de Consciência Autônoma
+  conscience deactivate - Desativa o Módulo de Consciência Autônoma
+  conscience status   - Exibe status do Módulo de Consciência
+  audit     - Exibe relatório de auditoria de segurança
+  exit      - Encerra o sistema"""
+
+@functools.lru_cache(maxsize=128)
+def _display_label(key: str) -> str:
+    """Rótulo de exibição de uma chave de relatório (conjunto pequeno e fixo de chaves)"""
+    return key.replace('_', ' ').capitalize()
+
+def _display_value(value: Any) -> str:
+    """Valor de relatório formatado para exibição (floats com duas casas)"""
+    return f"{value:.2f}" if isinstance(value, float) else str(value)
+
+def _emit(buf: io.StringIO) -> None:
+    """Exibe um relatório montado em memória com uma única escrita no stdout"""
+    sys.stdout.write(buf.getvalue())
+    sys.stdout.flush()
+
+async def _cmd_evolve(core: AIGenesisCore, args: List[str]) -> Optional[bool]:
+    cycles = 1
+    if args:
+        try:
+            cycles = int(args[0])
+            if cycles <= 0:
+                 print("Erro: Número de ciclos deve ser positivo.")
+                 return None
+        except ValueError:
+            print(f"Erro: Número de ciclos inválido: {args[0]}")
+            return None
+    # Roda em segundo plano no loop do modo interativo, mantendo o prompt responsivo
+    if core.submit_manual_evolution(cycles) is None:
+        print("Evolução manual já em andamento. Use 'stop' para interrompê-la.")
+    return None
+
+async def _cmd_stop(core: AIGenesisCore, args: List[str]) -> Optional[bool]:
+    core.stop_manual_evolution()
+    return None
+
+async def _cmd_status(core: AIGenesisCore, args: List[str]) -> Optional[bool]:
+    metrics = core.get_system_metrics()
+    buf = io.StringIO()
+    w = buf.write
+    w("\n--- Status Geral do Sistema ---\n")
+    w(f"Ciclos de evolução manuais executados: {core.evolution_cycles}\n")
+    w(f"Evolução manual em andamento: {core.running}\n")
+    w("Métricas dos Componentes:\n")
+    for name, value in metrics.items():
+        w(f"  - {name}: {value}\n")
+    last_result = core.last_evolution_result
+    if last_result:
+         w("Resultado do Último Ciclo Manual:\n")
+         w(f"  - ID: {last_result.cycle_id}\n")
+         w(f"  - Duração: {last_result.duration_s:.2f}s\n")
+         w(f"  - Modificação Aplicada: {last_result.modification_applied}\n")
+         w(f"  - Erros: {len(last_result.errors)}\n")
+    _emit(buf)
+    return None
+
+async def _cmd_conscience(core: AIGenesisCore, args: List[str]) -> Optional[bool]:
+    if not args:
+         print("Uso: conscience [activate|deactivate|status]")
+         return None
+    sub_command = args[0].lower()
+    if sub_command == "activate":
+        core.activate_consciousness()
+    elif sub_command == "deactivate":
+        await asyncio.to_thread(core.deactivate_consciousness) # O join da thread pode levar segundos
+    elif sub_command == "status":
+        status = core.get_consciousness_status()
+        buf = io.StringIO()
+        w = buf.write
+        w("\n--- Status do Módulo de Consciência ---\n")
+        for key, value in status.items():
+             # Formata um pouco melhor a saída
+             w(f"  {_display_label(key)}: {_display_value(value)}\n")
+        _emit(buf)
+    else:
+         print(f"Subcomando desconhecido para conscience: {sub_command}")
+    return None
+
+async def _cmd_audit(core: AIGenesisCore, args: List[str]) -> Optional[bool]:
+    report = core.security.get_audit_report()
+    buf = io.StringIO()
+    w = buf.write
+    w("\n--- Relatório de Auditoria de Segurança ---\n")
+    for key, value in report.items():
+         if key == "last_modification" or key == "last_violation":
+              w(f"  {_display_label(key)}:\n")
+              if value:
+                   for k, v in value.items(): w(f"    - {k}: {v}\n")
+              else: w("    Nenhum\n")
+         else:
+              w(f"  {_display_label(key)}: {_display_value(value)}\n")
+    _emit(buf)
+    return None
+
+async def _cmd_exit(core: AIGenesisCore, args: List[str]) -> Optional[bool]:
+    print("Desativando consciência (se ativa) e encerrando...")
+    core.stop_manual_evolution() # Garante parada da evolução manual
+    await asyncio.to_thread(core.deactivate_consciousness) # Garante desativação ao sair (sem bloquear o loop)
+    return True
+
+# Linha de comando do REPL: nome do comando + argumentos (o caso dos argumentos é preservado)
+_CMD_RE = re.compile(r"^(\w+)(?:\s+(.*))?$")
+
+# Tabela de despacho: comando -> corrotina handler(core, args); retornar True encerra o loop
+COMMANDS: Dict[str, Callable[[AIGenesisCore, List[str]], Awaitable[Optional[bool]]]] = {
+    "evolve": _cmd_evolve,
+    "stop": _cmd_stop,
+    "status": _cmd_status,
+    "conscience": _cmd_conscience,
+    "audit": _cmd_audit,
+    "exit": _cmd_exit,
+}
+
+def _start_stdin_reader(loop: asyncio.AbstractEventLoop) -> "asyncio.Queue[Optional[str]]":
+    """Entrega as linhas de stdin a uma fila do loop de eventos (None indica fim da entrada).
+    A leitura roda em uma thread daemon com os.read direto no descritor: uma leitura pendente
+    não retém as travas do io e não impede o encerramento do processo (ex.: após Ctrl+C)."""
+    queue = asyncio.Queue()
+    encoding = sys.stdin.encoding or "utf-8"
+
+    def put(item: Optional[str]) -> None:
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            pass # Loop já encerrado
+
+    def reader() -> None:
+        fd = sys.stdin.fileno()
+        pending = b""
+        while True:
+            try:
+                chunk = os.read(fd, 4096)
+            except OSError:
+                chunk = b""
+            if not chunk:
+                if pending:
+                    put(pending.decode(encoding, "replace"))
+                put(None)
+                return
+            *lines, pending = (pending + chunk).split(b"\n")
+            for line in lines:
+                put(line.decode(encoding, "replace"))
+
+    threading.Thread(target=reader, name="ai-genesis-input", daemon=True).start()
+    return queue
+
+async def interactive_loop(core: AIGenesisCore) -> None:
+    """Loop do modo interativo: lê comandos sem bloquear as tarefas em segundo plano (ex.: evolve)"""
+    print(INTERACTIVE_HELP)
+    lines = _start_stdin_reader(asyncio.get_running_loop())
+    
+    while True:
+        try:
+            print("\n(AI-Genesis)> ", end="", flush=True)
+            cmd_line = await lines.get()
+            if cmd_line is None:
+                raise EOFError
+            cmd_line = cmd_line.strip()
+            if not cmd_line:
+                continue
+            match = _CMD_RE.match(cmd_line)
+            if match is None:
+                print(f"Comando desconhecido: {cmd_line}")
+                continue
+            
+            command = match.group(1).lower()
+            args = match.group(2).split() if match.group(2) else []
+            handler = COMMANDS.get(command)
+            if handler is None:
+                print(f"Comando desconhecido: {command}")
+            elif await handler(core, args):
+                break
+        
+        except (KeyboardInterrupt, asyncio.CancelledError, EOFError):
+            print("\nInterrupção detectada. Desativando e encerrando...")
+            core.stop_manual_evolution()
+            await asyncio.to_thread(core.deactivate_consciousness)
+            break
+        except (ValueError, KeyError) as e:
+            # Erros esperados de argumentos/comandos: apenas informados, sem rastreamento
+            print(f"\nErro de comando: {e}")
+        except Exception as e:
+            print(f"\nErro inesperado no loop interativo: {e}")
+            logger.exception("Erro inesperado no loop interativo")
+    
+    # Aguarda o término do ciclo em andamento (a parada já foi sinalizada)
+    if core.evolution_task is not None:
+        await asyncio.gather(core.evolution_task, return_exceptions=True)
+
+
 if __name__ == "__main__":
-    print("=" * 60)
-    print("  AI-Genesis Core - Sistema minimalista auto-evolutivo")
-    print("  Desenvolvido por Zylar de Xylos")
-    print("=" * 60)
+    print(BANNER)
     
     # Inicializa o sistema
     core = AIGenesisCore()
+    argv = sys.argv[1:]
+    if "--verbose" in argv:
+        core.dump_cycle_json = True # Grava também cycle_{id}.json a cada ciclo
+        argv.remove("--verbose")
     
     # Verifica argumentos de linha de comando para evolução manual
-    if len(sys.argv) > 1:
+    if argv:
         try:
-            cycles = int(sys.argv[1])
+            cycles = int(argv[0])
             if cycles > 0:
                  core.start_manual_evolution(cycles)
             else:
                  print("Número de ciclos deve ser positivo.")
         except ValueError:
-            print(f"Erro: Argumento inválido: {sys.argv[1]}. Use um número inteiro para ciclos.")
-            print("Uso: python core.py [numero_de_ciclos]")
+            print(f"Erro: Argumento inválido: {argv[0]}. Use um número inteiro para ciclos.")
+            print("Uso: python core.py [--verbose] [numero_de_ciclos]")
         # Encerra após execução via argumento
         print("\nAI-Genesis Core encerrado após execução via argumento.")
     else:
         # Modo interativo
-        print("\nModo interativo iniciado. Comandos disponíveis:")
-        print("  evolve N  - Executa N ciclos de evolução manual")
-        print("  stop      - Para a evolução manual em andamento")
-        print("  status    - Exibe status geral e métricas")
-        print("  conscience activate   - Ativa o Módulo de Consciência Autônoma")
-        print("  conscience deactivate - Desativa o Módulo de Consciência Autônoma")
-        print("  conscience status   - Exibe status do Módulo de Consciência")
-        print("  audit     - Exibe relatório de auditoria de segurança")
-        print("  exit      - Encerra o sistema")
-        
-        while True:
-            try:
-                cmd_line = input("\n(AI-Genesis)> ").strip().lower()
-                parts = cmd_line.split()
-                if not parts:
-                    continue
-                
-                command = parts[0]
-                args = parts[1:]
-                
-                if command == "evolve":
-                    cycles = 1
-                    if args:
-                        try:
-                            cycles = int(args[0])
-                            if cycles <= 0:
-                                 print("Erro: Número de ciclos deve ser positivo.")
-                                 continue
-                        except ValueError:
-                            print(f"Erro: Número de ciclos inválido: {args[0]}")
-                            continue
-                    # Roda em background para não bloquear o prompt? Não, por enquanto roda síncrono.
-                    core.start_manual_evolution(cycles)
-                
-                elif command == "stop":
-                     core.stop_manual_evolution()
-
-                elif command == "status":
-                    metrics = core.meta_cognition.evaluate_system(core.components)
-                    print("\n--- Status Geral do Sistema ---")
-                    print(f"Ciclos de evolução manuais executados: {core.evolution_cycles}")
-                    print(f"Evolução manual em andamento: {core.running}")
-                    print("Métricas dos Componentes:")
-                    for name, value in metrics.items():
-                        print(f"  - {name}: {value}")
-                    if core.last_evolution_result:
-                         print("Resultado do Último Ciclo Manual:")
-                         print(f"  - ID: {core.last_evolution_result.get('cycle_id')}")
-                         print(f"  - Duração: {core.last_evolution_result.get('duration_s'):.2f}s")
-                         print(f"  - Modificação Aplicada: {core.last_evolution_result.get('modification_applied')}")
-                         print(f"  - Erros: {len(core.last_evolution_result.get('errors',[]))}")
-
-                elif command == "conscience":
-                    if not args:
-                         print("Uso: conscience [activate|deactivate|status]")
-                         continue
-                    sub_command = args[0]
-                    if sub_command == "activate":
-                        core.activate_consciousness()
-                    elif sub_command == "deactivate":
-                        core.deactivate_consciousness()
-                    elif sub_command == "status":
-                        status = core.get_consciousness_status()
-                        print("\n--- Status do Módulo de Consciência ---")
-                        for key, value in status.items():
-                             # Formata um pouco melhor a saída
-                             if isinstance(value, float): value_str = f"{value:.2f}"
-                             else: value_str = str(value)
-                             print(f"  {key.replace('_',' ').capitalize()}: {value_str}")
-                    else:
-                         print(f"Subcomando desconhecido para conscience: {sub_command}")
-
-                elif command == "audit":
-                     report = core.security.get_audit_report()
-                     print("\n--- Relatório de Auditoria de Segurança ---")
-                     for key, value in report.items():
-                          if key == "last_modification" or key == "last_violation":
-                               print(f"  {key.replace('_',' ').capitalize()}:")
-                               if value:
-                                    for k, v in value.items(): print(f"    - {k}: {v}")
-                               else: print("    Nenhum")
-                          else:
-                               value_str = f"{value:.2f}" if isinstance(value, float) else str(value)
-                               print(f"  {key.replace('_',' ').capitalize()}: {value_str}")
-
-                elif command == "exit":
-                    print("Desativando consciência (se ativa) e encerrando...")
-                    core.deactivate_consciousness() # Garante desativação ao sair
-                    core.stop_manual_evolution() # Garante parada da evolução manual
-                    break
-                
-                else:
-                    print(f"Comando desconhecido: {command}")
-            
-            except KeyboardInterrupt:
-                print("\nInterrupção detectada. Desativando e encerrando...")
-                core.deactivate_consciousness()
-                core.stop_manual_evolution()
-                break
-            except Exception as e:
-                print(f"\nErro inesperado no loop interativo: {e}")
-                logger.error("Erro no loop interativo", exc_info=True)
+        asyncio.run(interactive_loop(core))
     
+    core.shutdown() # Garante que as gravações em segundo plano foram concluídas
     print("\nAI-Genesis Core encerrado.")
 
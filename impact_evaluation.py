@@ -13,6 +13,7 @@ import time
 from typing import Dict, List, Any, Optional, Tuple
 import ast
 import re
+import zlib
 
 # Configuração de logging
 logger = logging.getLogger("AI-Genesis.ImpactEvaluation")
@@ -35,17 +36,41 @@ class ImpactEvaluationEngine:
         logger.info("Motor de Avaliação de Impacto inicializado")
     
     def _load_cycle_history(self) -> None:
-        """Carrega o histórico de ciclos evolutivos dos arquivos JSON"""
+        """Carrega o histórico de ciclos evolutivos do log cycles.jsonl e de arquivos JSON avulsos"""
         if not os.path.exists(self.history_dir):
             logger.warning(f"Diretório de histórico {self.history_dir} não encontrado")
             return
         
+        # cycles.jsonl acumula todas as execuções, mas cycle_id recomeça em 1 a cada uma:
+        # mantém só o registro mais recente de cada ciclo (o run_id do registro localiza seu diff)
+        latest = {}
+        log_path = os.path.join(self.history_dir, "cycles.jsonl")
+        if os.path.exists(log_path):
+            try:
+                with open(log_path, 'r', encoding='utf-8') as f:
+                    for line_no, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            record = json.loads(line)
+                        except json.JSONDecodeError as e:
+                            # Última linha pode estar truncada se o processo foi interrompido
+                            logger.error(f"Registro de ciclo inválido em {log_path}:{line_no}: {e}")
+                            continue
+                        latest.pop(record.get("cycle_id"), None) # Reinsere no fim: preserva a ordem cronológica
+                        latest[record.get("cycle_id")] = record
+            except Exception as e:
+                logger.error(f"Erro ao carregar log de ciclos {log_path}: {e}")
+        self.cycle_history.extend(latest.values())
+        
         cycle_files = sorted([f for f in os.listdir(self.history_dir) if f.startswith("cycle_") and f.endswith(".json")])
         
         for file in cycle_files:
             try:
                 with open(os.path.join(self.history_dir, file), 'r') as f:
                     cycle_data = json.load(f)
+                # Arquivos avulsos são cópias legíveis (--verbose) ou anteriores ao log: o log prevalece
+                if cycle_data.get("cycle_id") not in latest:
                     self.cycle_history.append(cycle_data)
             except Exception as e:
                 logger.error(f"Erro ao carregar arquivo de ciclo {file}: {e}")
@@ -85,7 +110,8 @@ class ImpactEvaluationEngine:
             # Compara métricas com o ciclo anterior
             prev_metrics = None
             for cycle in self.cycle_history:
-                if cycle.get("cycle_id") == cycle_id - 1:
+                # Só compara com o ciclo anterior da mesma execução
+                if cycle.get("cycle_id") == cycle_id - 1 and cycle.get("run_id") == cycle_data.get("run_id"):
                     prev_metrics = cycle.get("metrics", {})
                     break
             
@@ -141,7 +167,7 @@ class ImpactEvaluationEngine:
                 
                 # Análise de diferenças
                 metrics["code_diff"] = {
-                    "lines_added": len(current_code.split('\n')) - len(previous_code.split('\n')),
+                    "lines_added": current_code.count('\n') - previous_code.count('\n'),
                     "size_diff_bytes": len(current_code) - len(previous_code),
                     "size_diff_percent": (len(current_code) - len(previous_code)) / len(previous_code) * 100 if previous_code else 0
                 }
@@ -159,12 +185,53 @@ class ImpactEvaluationEngine:
             except Exception as e:
                 logger.error(f"Erro na análise de código para ciclo {cycle_id}: {e}")
                 metrics["code_analysis_error"] = str(e)
+        elif os.path.exists(self._diff_path(cycle_data)):
+            # O Core grava apenas o diff comprimido na maioria dos ciclos
+            try:
+                metrics["code_diff"] = self._diff_stats(self._diff_path(cycle_data))
+            except Exception as e:
+                logger.error(f"Erro na análise do diff para ciclo {cycle_id}: {e}")
+                metrics["code_analysis_error"] = str(e)
         
         # Armazena as métricas de impacto
         self.impact_metrics[cycle_id] = metrics
         
         return metrics
     
+    def _diff_path(self, cycle_data: Dict[str, Any]) -> str:
+        """Caminho do diff comprimido de um ciclo: {run_id}_c{id}.diff.z (ou c{id}.diff.z em registros sem run_id)"""
+        run_id = cycle_data.get("run_id")
+        name = f"c{cycle_data.get('cycle_id')}.diff.z"
+        return os.path.join(self.history_dir, f"{run_id}_{name}" if run_id else name)
+
+    def _diff_stats(self, diff_path: str) -> Dict[str, Any]:
+        """
+        Calcula estatísticas de código a partir de um diff unificado comprimido (zlib).
+        
+        Args:
+            diff_path: Caminho do arquivo {run_id}_c{id}.diff.z gravado pelo Core
+            
+        Returns:
+            Dicionário com linhas adicionadas (saldo) e diferença de tamanho em bytes
+        """
+        with open(diff_path, 'rb') as f:
+            diff = zlib.decompress(f.read()).decode('utf-8')
+        
+        lines_added = 0
+        size_diff = 0
+        for line in diff.splitlines(keepends=True):
+            if line.startswith('+') and not line.startswith('+++'):
+                lines_added += 1
+                size_diff += len(line) - 1
+            elif line.startswith('-') and not line.startswith('---'):
+                lines_added -= 1
+                size_diff -= len(line) - 1
+        
+        return {
+            "lines_added": lines_added,
+            "size_diff_bytes": size_diff
+        }
+    
     def generate_feedback(self, impact_metrics: Dict[str, Any]) -> Dict[str, Any]:
         """
         Gera feedback baseado nas métricas de impacto para orientar futuras transformações.
@@ -219,7 +286,7 @@ class ImpactEvaluationEngine:
         # Análise de mudanças específicas em métricas
         if "complexity_changes" in impact_metrics:
             for metric, change in impact_metrics["complexity_changes"].items():
-                component = metric.split("_")[0]
+                component = metric.partition("_")[0]
                 if change > 1.2:  # Aumento significativo de complexidade
                     feedback["recommendations"].append({
                         "type": "refactor",
@@ -230,7 +297,7 @@ class ImpactEvaluationEngine:
         
         if "performance_changes" in impact_metrics:
             for metric, change in impact_metrics["performance_changes"].items():
-                component = metric.split("_")[0]
+                component = metric.partition("_")[0]
                 if change < 0.8:  # Redução significativa de desempenho
                     feedback["recommendations"].append({
                         "type": "optimize",
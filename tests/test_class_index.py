@@ -0,0 +1,81 @@
+"""Testes do índice de classes de CodeTransformationEngine (_class_index).
+
+Os offsets devem coincidir com os da localização anterior: source_code.find("class Nome")
+para o início e a soma dos comprimentos das linhas até end_lineno para o fim.
+"""
+
+import ast
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core  # noqa: E402
+
+SAMPLE = (
+    "import os\n"
+    "\n"
+    "class First:\n"
+    "    class Inner:\n"
+    "        pass\n"
+    "\n"
+    "    def run(self):\n"
+    "        return 1\n"
+    "\n"
+    "def helper():\n"
+    "    return 2\n"
+    "\n"
+    "class Second(First):\n"
+    "    value = 3"
+)
+
+
+def _legacy_span(source_code, tree, name):
+    """Localização usada antes do índice (busca por string + end_lineno da AST)"""
+    start = source_code.find(f"class {name}")
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.name == name:
+            lines = source_code.splitlines()
+            if node.end_lineno < len(lines):
+                return start, sum(len(line) + 1 for line in lines[:node.end_lineno])
+            return start, len(source_code)
+    return None
+
+
+class ClassIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.engine = core.CodeTransformationEngine()
+
+    def test_offsets_match_legacy_search(self):
+        tree = ast.parse(SAMPLE)
+        index = self.engine._class_index(SAMPLE, tree)
+        self.assertEqual(set(index), {"First", "Second"}) # Apenas classes de nível superior
+        for name, span in index.items():
+            with self.subTest(name=name):
+                self.assertEqual(span, _legacy_span(SAMPLE, tree, name))
+                self.assertTrue(SAMPLE.startswith(f"class {name}", span[0]))
+        self.assertEqual(index["Second"][1], len(SAMPLE)) # Última classe sem quebra de linha final
+
+    def test_offsets_match_legacy_search_on_core_source(self):
+        with open(core.__file__, encoding="utf-8") as f:
+            source_code = f.read()
+        tree = ast.parse(source_code)
+        index = self.engine._class_index(source_code, tree)
+        self.assertLessEqual(set(core._MODULE_TO_CLASS_MAP.values()) - {"ConsciousnessModule"}, set(index))
+        for name in index:
+            with self.subTest(name=name):
+                self.assertEqual(index[name], _legacy_span(source_code, tree, name))
+
+    def test_index_is_reused_for_the_same_tree(self):
+        tree = ast.parse(SAMPLE)
+        first = self.engine._class_index(SAMPLE, tree)
+        self.assertIs(self.engine._class_index(SAMPLE, tree), first)
+        self.assertIsNot(self.engine._class_index(SAMPLE, ast.parse(SAMPLE)), first)
+
+    def test_invalid_source(self):
+        self.assertIsNone(self.engine._class_index("class Broken(:\n    pass\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
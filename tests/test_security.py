@@ -0,0 +1,94 @@
+"""Testes da verificação de segurança de modificações (SecurityLoggingMechanism.check_security).
+
+Fixam os resultados da análise por diferença de linhas, que substituiu o difflib.Differ:
+apenas as linhas novas são verificadas, com ou sem a AST do código completo.
+"""
+
+import ast
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core  # noqa: E402
+
+ORIGINAL = (
+    "import os\n"
+    "\n"
+    "class Worker:\n"
+    "    def run(self):\n"
+    "        return 1\n"
+)
+
+
+class CheckSecurityModificationTest(unittest.TestCase):
+    def setUp(self):
+        self.security = core.SecurityLoggingMechanism()
+
+    def check(self, code, original=ORIGINAL, with_tree=False):
+        tree = ast.parse(code) if with_tree else None
+        return self.security.check_security(code, is_modification=True, original_code=original, tree=tree)
+
+    def test_dangerous_import_added_inside_class(self):
+        code = ORIGINAL.replace(
+            "        return 1\n",
+            "        return 1\n"
+            "\n"
+            "    def spawn(self):\n"
+            "        import subprocess\n"
+            "        return subprocess\n",
+        )
+        # O trecho indentado não é parseável isoladamente: sem AST prévia, o código completo é parseado
+        for with_tree in (False, True):
+            with self.subTest(with_tree=with_tree):
+                is_secure, message = self.check(code, with_tree=with_tree)
+                self.assertFalse(is_secure)
+                self.assertIn("Importação sensível: subprocess", message)
+
+    def test_eval_in_new_line(self):
+        code = ORIGINAL.replace("        return 1\n", "        value = eval('1')\n        return value\n")
+        is_secure, message = self.check(code, with_tree=True)
+        self.assertFalse(is_secure)
+        self.assertIn("Uso de eval", message)
+        self.assertIn("Código modificado (2 linhas)", message)
+        self.assertEqual(self.security.total_violations, 1)
+
+    def test_unchanged_dangerous_line_is_not_rechecked(self):
+        original = ORIGINAL + "\nRESULT = eval('1 + 1')\nimport socket\n"
+        code = original + "\nLIMIT = 10\n"
+        for with_tree in (False, True):
+            with self.subTest(with_tree=with_tree):
+                is_secure, message = self.check(code, original=original, with_tree=with_tree)
+                self.assertTrue(is_secure)
+                self.assertEqual(message, "Código seguro")
+        self.assertEqual(self.security.total_violations, 0)
+
+    def test_identical_code(self):
+        is_secure, message = self.check(ORIGINAL)
+        self.assertTrue(is_secure)
+        self.assertEqual(message, "Nenhuma modificação significativa detectada")
+
+    def test_crlf_input(self):
+        original = ORIGINAL.replace("\n", "\r\n") + "RESULT = eval('2')\r\n"
+        safe = original + "LIMIT = 10\r\n"
+        is_secure, message = self.check(safe, original=original, with_tree=True)
+        self.assertTrue(is_secure)
+        self.assertEqual(message, "Código seguro")
+
+        unsafe = original + "VALUE = exec('pass')\r\n"
+        is_secure, message = self.check(unsafe, original=original, with_tree=True)
+        self.assertFalse(is_secure)
+        self.assertIn("Uso de exec", message)
+        self.assertNotIn("Uso de eval", message)
+        self.assertIn("Código modificado (1 linhas)", message)
+
+    def test_repeated_check_still_records_violation(self):
+        code = ORIGINAL + "VALUE = eval('1')\n"
+        self.check(code)
+        self.check(code)
+        self.assertEqual(self.security.total_violations, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()